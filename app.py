@@ -2,7 +2,17 @@ import streamlit as st
 import matplotlib.pyplot as plt
 import numpy as np
 import time
-import math
+import io
+
+from backend.closest_pair import ALGORITHMS, ENGINES, closest_pair
+from backend.metrics import METRICS
+from backend.mult_batch import multiply_batch
+from backend.mult_steps import (
+    STEP_METHODS, ProductCache, StepCursor, karatsuba_node_counts, karatsuba_steps, toom3_steps,
+)
+from backend.point_io import parse_points
+from backend.spatial_index import PointIndex
+from backend.trace import Trace, FINAL, NOTE
 
 st.set_page_config(page_title="DAA Project", layout="wide")
 
@@ -155,182 +165,218 @@ algo_choice = st.sidebar.selectbox(
     ["Closest Pair of Points", "Integer Multiplication"]
 )
 
-# Helper Functions
-def distance(p1, p2):
-    return math.dist(p1, p2)
+# Labels of the backend engines, algorithms and methods; options added to the
+# backend appear under their own names until they get a label here
+ENGINE_LABELS = {"python": "Python (step-by-step)", "numpy": "NumPy (fast)"}
+ALGORITHM_LABELS = {"dc": "Divide & Conquer", "grid": "Randomized grid (expected O(n))"}
+METHOD_LABELS = {"karatsuba": "Karatsuba", "toom3": "Toom-Cook 3-way"}
 
-def brute_force_closest(points, steps=None):
-    """Brute force for small sets (base case)"""
-    min_dist = float("inf")
-    pair = (None, None)
-    n = len(points)
-    
-    if steps is not None:
-        steps.append(f"  Base case: Brute force on {n} points")
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-            d = distance(points[i], points[j])
-            if d < min_dist:
-                min_dist = d
-                pair = (points[i], points[j])
-                if steps is not None:
-                    steps.append(f"    New min: {min_dist:.4f} between {points[i]} and {points[j]}")
-    
-    if steps is not None:
-        steps.append(f"  ✓ Base case result: distance = {min_dist:.4f}")
-    return min_dist, pair
-
-def closest_pair_recursive(px, py, depth=0, steps=None):
-    """Recursive divide and conquer closest pair"""
-    indent = "  " * depth
-    n = len(px)
-    
-    
-    # Base case
-    if n <= 3:
-        return brute_force_closest(px, steps)
-    
-    # DIVIDE: Split into left and right halves
-    mid = n // 2
-    mid_x = px[mid][0]
-    
-    if steps is not None:
-        steps.append(f"{indent}DIVIDE: Splitting at x = {mid_x:.2f}")
-        steps.append(f"{indent}   Left: {len(px[:mid])} points, Right: {len(px[mid:])} points")
-    
-    Qx = px[:mid]  # Left half
-    Rx = px[mid:]  # Right half
-    
-    # Create y-sorted lists for left and right
-    Qy = [p for p in py if p[0] <= mid_x]
-    Ry = [p for p in py if p[0] > mid_x]
-    
-    # CONQUER: Recursive calls
-    if steps is not None:
-        steps.append(f"{indent}CONQUER: Solving left half recursively")
-    left_min, left_pair = closest_pair_recursive(Qx, Qy, depth + 1, steps)
-    
-    if steps is not None:
-        steps.append(f"{indent} CONQUER: Solving right half recursively")
-    right_min, right_pair = closest_pair_recursive(Rx, Ry, depth + 1, steps)
-    
-    # Find minimum from left and right
-    if left_min < right_min:
-        min_dist = left_min
-        min_pair = left_pair
-        if steps is not None:
-            steps.append(f"{indent}   Left result is better: {left_min:.4f}")
+# Cached work: Streamlit reruns the whole script on every click, so parsing,
+# algorithm runs and figures are keyed on the uploaded bytes plus parameters
+# and only recomputed when one of them changes
+def figure_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return buf.getvalue()
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def parse_point_upload(name, data):
+    """(n, 2) array of an uploaded point file or the points of a prebuilt index"""
+    if name.endswith(".npz"):
+        return PointIndex.load(io.BytesIO(data)).points
+    return parse_points(data)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def run_closest_pair(name, data, engine, algorithm, metric_name):
+    """(distance, pair, trace, elapsed) of an uploaded file, solved by the backend closest_pair"""
+    points = parse_point_upload(name, data)
+    if metric_name != "euclidean":
+        # other metrics are only supported by the python divide and conquer
+        engine, algorithm = "python", "dc"
+    # the vectorized engine takes the array, the python ones tuples
+    pts = points if engine == "numpy" and algorithm == "dc" else list(map(tuple, points.tolist()))
+    trace = Trace.capped(points)
+    start = time.perf_counter()
+    if name.endswith(".npz") and engine == "numpy" and algorithm == "dc":
+        # a prebuilt index answers from its stored closest pair
+        d, i, j = PointIndex.load(io.BytesIO(data)).closest_pair_indices()
+        trace.bind(points)
+        trace.emit(NOTE, a=0)
+        trace.emit(FINAL, 0, i, j, d=d)
+        pair = (trace.point(i), trace.point(j))
     else:
-        min_dist = right_min
-        min_pair = right_pair
-        if steps is not None:
-            steps.append(f"{indent}   Right result is better: {right_min:.4f}")
-    
-    # COMBINE: Check strip around midline
-    if steps is not None:
-        steps.append(f"{indent}COMBINE: Checking strip ±{min_dist:.4f} around x={mid_x:.2f}")
-    
-    strip = [p for p in py if abs(p[0] - mid_x) < min_dist]
-    strip_len = len(strip)
-    
-    if steps is not None:
-        steps.append(f"{indent}   Strip contains {strip_len} points")
-    
-    # Check points in strip (only need to check next 7 points)
-    strip_improved = False
-    for i in range(strip_len):
-        j = i + 1
-        while j < strip_len and (strip[j][1] - strip[i][1]) < min_dist:
-            d = distance(strip[i], strip[j])
-            if d < min_dist:
-                min_dist = d
-                min_pair = (strip[i], strip[j])
-                strip_improved = True
-                if steps is not None:
-                    steps.append(f"{indent}   NEW CLOSEST in strip: {strip[i]} ↔ {strip[j]}")
-                    steps.append(f"{indent}   New distance: {min_dist:.4f}")
-            j += 1
-    
-    if steps is not None:
-        if strip_improved:
-            steps.append(f"{indent}Strip improved the result!")
-        else:
-            steps.append(f"{indent}   Strip didn't improve result")
-        steps.append(f"{indent}Level {depth} complete: min_dist = {min_dist:.4f}")
-    
-    return min_dist, min_pair
+        d, pair = closest_pair(pts, trace, engine=engine, algorithm=algorithm, metric=metric_name)
+    return d, pair, trace, time.perf_counter() - start
 
-def closest_pair(points):
-    """Main divide and conquer closest pair algorithm"""
-    steps = []
-    n = len(points)
-    
-    if n < 2:
-        return None, None, ["Need at least 2 points"]
-    
-    steps.append(f" Starting Divide & Conquer Closest Pair")
-    steps.append(f"   Total points: {n}")
-    steps.append(f"   Time Complexity: O(n log n)")
-    
-    # Pre-sort points by x and y coordinates
-    steps.append("   Sorting points by x-coordinate...")
-    px = sorted(points, key=lambda p: (p[0], p[1]))
-    
-    steps.append("   Sorting points by y-coordinate...")
-    py = sorted(points, key=lambda p: (p[1], p[0]))
-    
-    steps.append("   Beginning recursive divide & conquer...")
-    steps.append("=" * 50)
-    
-    min_dist, min_pair = closest_pair_recursive(px, py, 0, steps)
-    
-    steps.append("=" * 50)
-    steps.append(f"   Closest Pair: {min_pair[0]} ↔ {min_pair[1]}")
-    steps.append(f"   Minimum Distance: {min_dist:.6f}")
-    
-    return min_dist, min_pair, steps
+@st.cache_data(max_entries=16, show_spinner=False)
+def parse_integer_upload(data):
+    """Integers of an uploaded file, one per non-empty line"""
+    return [int(line.strip()) for line in data.decode("utf-8").splitlines() if line.strip()]
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def multiply_uploads(data1, data2):
+    """([(a, b, a × b), ...], elapsed) for the paired integers of two uploaded files"""
+    nums1, nums2 = parse_integer_upload(data1), parse_integer_upload(data2)
+    start = time.perf_counter()
+    products = multiply_batch(nums1, nums2, workers=1)
+    elapsed = time.perf_counter() - start
+    return list(zip(nums1, nums2, products)), elapsed
 
+def format_step(step):
+    """Display line of a (x, y, product, description) step record of backend.mult_steps"""
+    x, y, product, description = step
+    if description in ("Base case", "Cache hit"):
+        return f"{description}: {x} × {y} = {product}"
+    return f"{x} × {y} = {product}<br>{description}"
+
+def step_cursor(a, b, method, cache=None):
+    """Steps of a × b by the backend step generators, generated only up to the step being viewed"""
+    if method == "karatsuba":
+        steps = karatsuba_steps(a, b, cache)
+        # one step per split and per base case, unless cache hits cut subtrees
+        count = None if cache is not None else sum(karatsuba_node_counts(a, b))
+    else:
+        steps, count = toom3_steps(a, b), None
+    return StepCursor(map(format_step, steps), count=count)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def closest_pair_png(pts, pair, d):
+    """Scatter plot of the points with the closest pair highlighted, as PNG bytes"""
+    # Create figure
+    fig, ax = plt.subplots(figsize=(10, 8))
+    fig.patch.set_facecolor('#0f172a')
+    ax.set_facecolor('#1e293b')
+
+    xs = pts[:, 0]
+    ys = pts[:, 1]
+
+    # Plot all points
+    ax.scatter(xs, ys, s=200, c='skyblue', edgecolor='#3b82f6', 
+              linewidth=2, alpha=0.8, label="All Points", zorder=3)
+
+    # Highlight closest pair
+    ax.scatter([pair[0][0], pair[1][0]], [pair[0][1], pair[1][1]], 
+              s=350, c='red', edgecolor='#f472b6', 
+              linewidth=3, label='Closest Pair', zorder=4)
+
+    # Draw line
+    ax.plot([pair[0][0], pair[1][0]], [pair[0][1], pair[1][1]], 
+           'r--', linewidth=3, alpha=0.8, zorder=2)
+
+    # Add distance label
+    mid_x = (pair[0][0] + pair[1][0]) / 2
+    mid_y = (pair[0][1] + pair[1][1]) / 2
+    ax.text(mid_x, mid_y, f'd = {d:.4f}', 
+           fontsize=14, color='yellow', fontweight='bold',
+           bbox=dict(boxstyle='round,pad=0.5', facecolor='#1e293b', 
+                    edgecolor='yellow', linewidth=2),
+           ha='center', va='bottom')
+
+    ax.legend(fontsize=11, facecolor='#1e293b', edgecolor='#8b5cf6', 
+             labelcolor='white')
+    ax.set_xlabel("X Coordinate", color='white', fontsize=12, fontweight='bold')
+    ax.set_ylabel("Y Coordinate", color='white', fontsize=12, fontweight='bold')
+    ax.set_title(f"Closest Pair Visualization (Distance = {d:.4f})", 
+                color='white', fontsize=14, fontweight='bold', pad=15)
+    ax.tick_params(colors='white')
+    ax.grid(True, alpha=0.3, linestyle='--', color='#60a5fa')
+
+    for spine in ax.spines.values():
+        spine.set_color('#8b5cf6')
+        spine.set_linewidth(2)
+
+    plt.tight_layout()
+    return figure_png(fig)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def products_png(results, current_idx):
+    """Bar chart of the products (current one highlighted) and their histogram, as PNG bytes"""
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10))
+    fig.patch.set_facecolor('#0f172a')
+
+    # Plot 1: Product values
+    ax1.set_facecolor('#1e293b')
+    indices = range(1, len(results) + 1)
+    products = [final for _, _, final in results]
+
+    bars = ax1.bar(indices, products, color='#60a5fa', alpha=0.8, 
+                  edgecolor='#3b82f6', linewidth=1.5)
+
+    # Highlight current multiplication
+    if results:
+        bars[current_idx].set_color('#ec4899')
+        bars[current_idx].set_edgecolor('#f472b6')
+        bars[current_idx].set_linewidth(3)
+
+    ax1.set_xlabel("Multiplication #", color='white', fontsize=12, fontweight='bold')
+    ax1.set_ylabel("Product Value", color='white', fontsize=12, fontweight='bold')
+    ax1.set_title("Multiplication Results", color='white', fontsize=14, fontweight='bold', pad=15)
+    ax1.tick_params(colors='white', labelsize=10)
+    ax1.grid(axis='y', alpha=0.3, linestyle='--', color='#60a5fa')
+
+    # Plot 2: Histogram
+    ax2.set_facecolor('#1e293b')
+    if len(products) > 1:
+        n, bins, patches = ax2.hist(products, bins=min(15, len(products)//2 or 1), 
+                color='#10b981', alpha=0.8, edgecolor='white', linewidth=1.5)
+
+        # Color gradient
+        for i, patch in enumerate(patches):
+            patch.set_facecolor(plt.cm.viridis(i / len(patches)))
+
+    ax2.set_xlabel("Product Value", color='white', fontsize=12, fontweight='bold')
+    ax2.set_ylabel("Frequency", color='white', fontsize=12, fontweight='bold')
+    ax2.set_title("Product Distribution", color='white', fontsize=14, fontweight='bold', pad=15)
+    ax2.tick_params(colors='white', labelsize=10)
+    ax2.grid(axis='both', alpha=0.3, linestyle='--', color='#60a5fa')
+
+    for ax in [ax1, ax2]:
+        for spine in ax.spines.values():
+            spine.set_color('#8b5cf6')
+            spine.set_linewidth(2)
+
+    plt.tight_layout()
+    return figure_png(fig)
 
-def multiply_simple(a, b):
-    steps = []
-    b_str = str(b)
-    partials = []
-    
-    for i, digit in enumerate(reversed(b_str)):
-        partial = a * int(digit) * (10 ** i)
-        partials.append(partial)
-        steps.append(f"{a} × {digit} (shift {i}) = {partial:,}")
-    
-    final = sum(partials)
-    return final, partials, steps
 
 # ================= CLOSEST PAIR =================
 if algo_choice == "Closest Pair of Points":
     st.header("Closest Pair of Points Visualizer")
     
     uploaded_file = st.file_uploader(
-        "Upload a text file with points (x y per line):",
-        type=["txt"],
+        "Upload a text file with points (x y per line) or a prebuilt index (.npz):",
+        type=["txt", "npz"],
         key="closest_pair_file"
     )
     
+    engine = st.sidebar.selectbox(
+        "Engine",
+        ENGINES,
+        format_func=lambda e: ENGINE_LABELS.get(e, e),
+        key="cp_engine"
+    )
+    
+    algorithm = st.sidebar.selectbox(
+        "Algorithm",
+        ALGORITHMS,
+        format_func=lambda a: ALGORITHM_LABELS.get(a, a),
+        help="only the divide and conquer on the Python engine records every step",
+        key="cp_algorithm"
+    )
+    
+    metric_name = st.sidebar.selectbox(
+        "Distance metric",
+        list(METRICS),
+        help="haversine reads points as 'lat lon' in degrees and reports km; "
+             "metrics other than euclidean use the Python divide and conquer",
+        key="cp_metric"
+    )
+    
     if uploaded_file is not None:
         try:
-            file_contents = uploaded_file.read().decode("utf-8").splitlines()
-            points = []
-            
-            try:
-                n = int(file_contents[0])
-                for line in file_contents[1:n+1]:
-                    x, y = map(float, line.strip().split())
-                    points.append((x, y))
-            except:
-                for line in file_contents:
-                    if line.strip():
-                        x, y = map(float, line.strip().split())
-                        points.append((x, y))
+            # Bulk-parse into an (n, 2) float64 array, once per file content
+            points = parse_point_upload(uploaded_file.name, uploaded_file.getvalue())
             
             if len(points) < 2:
                 st.warning("Need at least 2 points")
@@ -349,9 +395,8 @@ if algo_choice == "Closest Pair of Points":
                 col1, col2, col3 = st.columns([2, 2, 2])
                 with col1:
                     if st.button("Run Algorithm", key="run_cp"):
-                        start = time.perf_counter()
-                        d, pair, steps = closest_pair(points)
-                        elapsed = time.perf_counter() - start
+                        d, pair, steps, elapsed = run_closest_pair(
+                            uploaded_file.name, uploaded_file.getvalue(), engine, algorithm, metric_name)
                         st.session_state.cp_steps = steps
                         st.session_state.cp_result = (d, pair, elapsed, points)
                         st.session_state.cp_current_step = 0
@@ -423,8 +468,9 @@ if algo_choice == "Closest Pair of Points":
                                     st.session_state.cp_current_step = total_steps - 1
                                     st.rerun()
                             
-                            # Display current step
-                            current_step = st.session_state.cp_steps[st.session_state.cp_current_step]
+                            # Display current step (rendered from the trace on demand)
+                            current_step = st.session_state.cp_steps.render(st.session_state.cp_current_step)
+                            current_step = current_step.replace("\n", "<br>")
                             st.markdown(
                                 f"<div class='step-card'>{current_step}</div>",
                                 unsafe_allow_html=True
@@ -441,51 +487,7 @@ if algo_choice == "Closest Pair of Points":
                     with right_col:
                         st.subheader("Visualization")
                         
-                        # Create figure
-                        fig, ax = plt.subplots(figsize=(10, 8))
-                        fig.patch.set_facecolor('#0f172a')
-                        ax.set_facecolor('#1e293b')
-                        
-                        xs = [p[0] for p in pts]
-                        ys = [p[1] for p in pts]
-                        
-                        # Plot all points
-                        ax.scatter(xs, ys, s=200, c='skyblue', edgecolor='#3b82f6', 
-                                  linewidth=2, alpha=0.8, label="All Points", zorder=3)
-                        
-                        # Highlight closest pair
-                        ax.scatter([pair[0][0], pair[1][0]], [pair[0][1], pair[1][1]], 
-                                  s=350, c='red', edgecolor='#f472b6', 
-                                  linewidth=3, label='Closest Pair', zorder=4)
-                        
-                        # Draw line
-                        ax.plot([pair[0][0], pair[1][0]], [pair[0][1], pair[1][1]], 
-                               'r--', linewidth=3, alpha=0.8, zorder=2)
-                        
-                        # Add distance label
-                        mid_x = (pair[0][0] + pair[1][0]) / 2
-                        mid_y = (pair[0][1] + pair[1][1]) / 2
-                        ax.text(mid_x, mid_y, f'd = {d:.4f}', 
-                               fontsize=14, color='yellow', fontweight='bold',
-                               bbox=dict(boxstyle='round,pad=0.5', facecolor='#1e293b', 
-                                        edgecolor='yellow', linewidth=2),
-                               ha='center', va='bottom')
-                        
-                        ax.legend(fontsize=11, facecolor='#1e293b', edgecolor='#8b5cf6', 
-                                 labelcolor='white')
-                        ax.set_xlabel("X Coordinate", color='white', fontsize=12, fontweight='bold')
-                        ax.set_ylabel("Y Coordinate", color='white', fontsize=12, fontweight='bold')
-                        ax.set_title(f"Closest Pair Visualization (Distance = {d:.4f})", 
-                                    color='white', fontsize=14, fontweight='bold', pad=15)
-                        ax.tick_params(colors='white')
-                        ax.grid(True, alpha=0.3, linestyle='--', color='#60a5fa')
-                        
-                        for spine in ax.spines.values():
-                            spine.set_color('#8b5cf6')
-                            spine.set_linewidth(2)
-                        
-                        plt.tight_layout()
-                        st.pyplot(fig)
+                        st.image(closest_pair_png(pts, pair, d))
         
         except Exception as e:
             st.error(f"Error: {e}")
@@ -496,63 +498,22 @@ if algo_choice == "Closest Pair of Points":
 elif algo_choice == "Integer Multiplication":
     st.header("Integer Multiplication Visualizer - Divide & Conquer")
     
-    # Divide and Conquer multiplication functions
-    def karatsuba_multiply(x, y, depth=0):
-        """Karatsuba divide-and-conquer multiplication algorithm"""
-        steps = []
-        indent = "  " * depth
-        
-        # Base case: if numbers are small enough, use regular multiplication
-        if x < 10 or y < 10:
-            result = x * y
-            steps.append(f"{indent}Base case: {x} × {y} = {result}")
-            return result, steps
-        
-        # Calculate the size of the numbers
-        n = max(len(str(x)), len(str(y)))
-        m = n // 2
-        
-        # Split the digit sequences in the middle
-        high1, low1 = x // (10**m), x % (10**m)
-        high2, low2 = y // (10**m), y % (10**m)
-        
-        steps.append(f"{indent}Splitting: {x} = {high1}×10^{m} + {low1}")
-        steps.append(f"{indent}Splitting: {y} = {high2}×10^{m} + {low2}")
-        
-        # Recursive steps
-        steps.append(f"{indent}Computing z0 = {low1} × {low2}")
-        z0, steps0 = karatsuba_multiply(low1, low2, depth + 1)
-        
-        steps.append(f"{indent}Computing z1 = ({low1} + {high1}) × ({low2} + {high2})")
-        z1, steps1 = karatsuba_multiply((low1 + high1), (low2 + high2), depth + 1)
-        
-        steps.append(f"{indent}Computing z2 = {high1} × {high2}")
-        z2, steps2 = karatsuba_multiply(high1, high2, depth + 1)
-        
-        # Combine the results
-        result = z2 * (10**(2*m)) + (z1 - z2 - z0) * (10**m) + z0
-        
-        steps.extend(steps0)
-        steps.extend(steps1)
-        steps.extend(steps2)
-        
-        steps.append(f"{indent}Combining: z2×10^{2*m} + (z1-z2-z0)×10^{m} + z0")
-        steps.append(f"{indent}Combining: {z2}×10^{2*m} + ({z1}-{z2}-{z0})×10^{m} + {z0}")
-        steps.append(f"{indent}Final result: {result}")
-        
-        return result, steps
-
-    def multiply_with_steps(a, b):
-        """Return final product and steps using divide-and-conquer"""
-        final, all_steps = karatsuba_multiply(a, b)
-        
-        # Format steps for display
-        formatted_steps = []
-        for step in all_steps:
-            formatted_steps.append(step)
-        
-        return final, formatted_steps
-
+    method = st.sidebar.selectbox(
+        "Method",
+        STEP_METHODS,
+        format_func=lambda m: METHOD_LABELS.get(m, m),
+        key="mult_method"
+    )
+    
+    use_cache = st.sidebar.checkbox(
+        "Reuse sub-products (memo cache)",
+        help="Karatsuba only: sub-products already computed are shown as one cache hit step",
+        disabled=(method != "karatsuba"),
+        key="mult_use_cache"
+    ) and method == "karatsuba"
+    if use_cache and "mult_cache" not in st.session_state:
+        st.session_state.mult_cache = ProductCache()
+    
     file1 = st.file_uploader("Upload first file (integers, one per line)", 
                              type=["txt"], key="file1")
     file2 = st.file_uploader("Upload second file (integers, one per line)", 
@@ -560,17 +521,9 @@ elif algo_choice == "Integer Multiplication":
     
     if file1 and file2:
         try:
-            # Read files
-            numbers1 = [int(line.strip()) for line in file1.read().decode("utf-8").splitlines() if line.strip()]
-            numbers2 = [int(line.strip()) for line in file2.read().decode("utf-8").splitlines() if line.strip()]
-            
-            # Process multiplications
-            results = []
-            start = time.perf_counter()
-            for a, b in zip(numbers1, numbers2):
-                final, steps = multiply_with_steps(a, b)
-                results.append((a, b, final, steps))
-            elapsed = time.perf_counter() - start
+            # Parse and multiply once per pair of file contents; steps are generated
+            # only for the multiplication on screen
+            results, elapsed = multiply_uploads(file1.getvalue(), file2.getvalue())
             
             # Session state
             if 'mult_current_idx' not in st.session_state:
@@ -645,7 +598,14 @@ elif algo_choice == "Integer Multiplication":
                 
                 # Current multiplication
                 idx = st.session_state.mult_current_idx
-                a, b, final, steps = results[idx]
+                a, b, final = results[idx]
+                # keep the cursor across reruns so moving one step generates at most one step
+                cursor_key = (a, b, method, use_cache)
+                if st.session_state.get("mult_cursor_key") != cursor_key:
+                    st.session_state.mult_cursor_key = cursor_key
+                    cache = st.session_state.mult_cache if use_cache else None
+                    st.session_state.mult_cursor = step_cursor(a, b, method, cache)
+                steps = st.session_state.mult_cursor
                 
                 st.markdown(f"""
                 <div class="step-card">
@@ -689,11 +649,11 @@ elif algo_choice == "Integer Multiplication":
                     # Add syntax highlighting for different types of steps
                     if "Base case" in step_text:
                         color = "#10b981"  # Green for base cases
-                    elif "Splitting" in step_text:
-                        color = "#f59e0b"  # Yellow for splitting
-                    elif "Computing" in step_text:
-                        color = "#3b82f6"  # Blue for recursive calls
-                    elif "Combining" in step_text:
+                    elif "Cache hit" in step_text:
+                        color = "#f59e0b"  # Yellow for reused sub-products
+                    elif "Sign" in step_text:
+                        color = "#3b82f6"  # Blue for sign handling
+                    elif "Combine" in step_text:
                         color = "#ec4899"  # Pink for combining
                     else:
                         color = "#c7d2fe"  # Default
@@ -736,7 +696,7 @@ elif algo_choice == "Integer Multiplication":
                 # Statistics
                 st.markdown("<div class='result-box'>", unsafe_allow_html=True)
                 st.write("**Statistics:**")
-                products = [final for _, _, final, _ in results]
+                products = [final for _, _, final in results]
                 col_a, col_b = st.columns(2)
                 with col_a:
                     st.metric("Max Product", f"{max(products):,}")
@@ -751,53 +711,7 @@ elif algo_choice == "Integer Multiplication":
                 st.markdown("<div class='result-box'>", unsafe_allow_html=True)
                 st.write("**Performance Analysis:**")
                 
-                fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10))
-                fig.patch.set_facecolor('#0f172a')
-                
-                # Plot 1: Product values
-                ax1.set_facecolor('#1e293b')
-                indices = range(1, len(results) + 1)
-                products = [final for _, _, final, _ in results]
-                
-                bars = ax1.bar(indices, products, color='#60a5fa', alpha=0.8, 
-                              edgecolor='#3b82f6', linewidth=1.5)
-                
-                # Highlight current multiplication
-                if results:
-                    current_idx = st.session_state.mult_current_idx
-                    bars[current_idx].set_color('#ec4899')
-                    bars[current_idx].set_edgecolor('#f472b6')
-                    bars[current_idx].set_linewidth(3)
-                
-                ax1.set_xlabel("Multiplication #", color='white', fontsize=12, fontweight='bold')
-                ax1.set_ylabel("Product Value", color='white', fontsize=12, fontweight='bold')
-                ax1.set_title("Multiplication Results", color='white', fontsize=14, fontweight='bold', pad=15)
-                ax1.tick_params(colors='white', labelsize=10)
-                ax1.grid(axis='y', alpha=0.3, linestyle='--', color='#60a5fa')
-                
-                # Plot 2: Histogram
-                ax2.set_facecolor('#1e293b')
-                if len(products) > 1:
-                    n, bins, patches = ax2.hist(products, bins=min(15, len(products)//2 or 1), 
-                            color='#10b981', alpha=0.8, edgecolor='white', linewidth=1.5)
-                    
-                    # Color gradient
-                    for i, patch in enumerate(patches):
-                        patch.set_facecolor(plt.cm.viridis(i / len(patches)))
-                
-                ax2.set_xlabel("Product Value", color='white', fontsize=12, fontweight='bold')
-                ax2.set_ylabel("Frequency", color='white', fontsize=12, fontweight='bold')
-                ax2.set_title("Product Distribution", color='white', fontsize=14, fontweight='bold', pad=15)
-                ax2.tick_params(colors='white', labelsize=10)
-                ax2.grid(axis='both', alpha=0.3, linestyle='--', color='#60a5fa')
-                
-                for ax in [ax1, ax2]:
-                    for spine in ax.spines.values():
-                        spine.set_color('#8b5cf6')
-                        spine.set_linewidth(2)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
+                st.image(products_png(results, st.session_state.mult_current_idx))
                 st.markdown("</div>", unsafe_allow_html=True)
         
         except Exception as e:
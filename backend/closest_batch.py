@@ -0,0 +1,105 @@
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+if __package__ in (None, ""):
+    # running as `python backend/closest_batch.py`: make the backend package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.metrics import METRICS
+from backend.point_io import NPY_SUFFIX, RAW_SUFFIXES
+
+# Files picked up when a directory is given
+POINT_SUFFIXES = (".txt", NPY_SUFFIX) + RAW_SUFFIXES
+
+
+def expand_inputs(specs):
+    """Turn directories, glob patterns and plain paths into a sorted list of point files"""
+    paths = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            paths.extend(os.path.join(spec, name) for name in os.listdir(spec)
+                         if os.path.splitext(name)[1].lower() in POINT_SUFFIXES)
+        elif glob.has_magic(spec):
+            paths.extend(glob.glob(spec))
+        else:
+            paths.append(spec)
+    return sorted(set(paths))
+
+
+def solve_file(path, engine="numpy", algorithm="dc", metric="euclidean"):
+    """Closest pair of one point file as a result dict (file, n, distance, pair, elapsed)"""
+    # imported here so pool workers pay for it once, not the parent at startup
+    from backend.closest_pair import closest_pair, read_points_from_file
+    from backend.point_io import load_points
+
+    start = time.perf_counter()
+    try:
+        if engine == "numpy":
+            pts = load_points(path)
+        else:
+            pts = read_points_from_file(path)
+        d, pair = closest_pair(pts, engine=engine, algorithm=algorithm, metric=metric)
+    except (OSError, ValueError) as e:
+        return {"file": path, "error": str(e)}
+    return {
+        "file": path,
+        "n": len(pts),
+        "distance": d,
+        "pair": [list(p) for p in pair] if pair else None,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def run_batch(paths, workers=None, engine="numpy", algorithm="dc", metric="euclidean", chunksize=4):
+    """Generate solve_file results for paths, in input order.
+
+    Files are spread over a process pool of `workers` processes that live
+    for the whole batch, so interpreter start-up and imports are paid once
+    per worker instead of once per file; chunksize files are sent to a
+    worker at a time. workers=1 solves everything in this process.
+    """
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            yield solve_file(path, engine, algorithm, metric)
+        return
+    n = len(paths)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(solve_file, paths, [engine] * n, [algorithm] * n, [metric] * n,
+                            chunksize=chunksize)
+
+
+# CLI run
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Closest pair of many point files, one JSON line per file")
+    parser.add_argument('inputs', nargs='+', help='point files, directories or glob patterns')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--engine', choices=("python", "numpy"), default=None,
+                        help='default: numpy, or python when --metric is not euclidean')
+    parser.add_argument('--algorithm', choices=("dc", "grid"), default='dc')
+    parser.add_argument('--metric', choices=list(METRICS), default='euclidean',
+                        help='distance metric (see backend/metrics.py)')
+    parser.add_argument('--chunksize', type=int, default=4, help='files handed to a worker at a time')
+    parser.add_argument('--output', help='write the JSON lines to this file instead of stdout', default=None)
+    args = parser.parse_args()
+    if args.engine is None:
+        args.engine = "numpy" if args.metric == "euclidean" else "python"
+    if args.metric != "euclidean" and (args.engine != "python" or args.algorithm != "dc"):
+        parser.error(f"--metric {args.metric} needs --engine python and --algorithm dc")
+
+    paths = expand_inputs(args.inputs)
+    out = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        for result in run_batch(paths, args.workers, args.engine, args.algorithm, args.metric,
+                                args.chunksize):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Processed {len(paths)} files in {time.perf_counter() - start:.3f}s", file=sys.stderr)
@@ -0,0 +1,116 @@
+import math
+import os
+import tempfile
+
+import numpy as np
+
+from backend.closest_nd import closest_pair_nd_indices
+from backend.closest_numpy import closest_pair_numpy_indices
+from backend.point_io import iter_point_chunks
+
+# Size of the uniform x sample used to place the slab boundaries
+SAMPLE_SIZE = 65536
+
+
+def _sample_x(path, chunk_size, rng):
+    """One pass over the file: point count, dimension and a uniform sample of x values.
+
+    Every point gets a random key and the SAMPLE_SIZE smallest keys are
+    kept (bottom-k sampling), so the sample stays bounded while streaming.
+    """
+    n = 0
+    dim = 2
+    keys = np.empty(0)
+    xs = np.empty(0)
+    for chunk in iter_point_chunks(path, chunk_size):
+        n += len(chunk)
+        dim = chunk.shape[1]
+        keys = np.concatenate((keys, rng.random(len(chunk))))
+        xs = np.concatenate((xs, chunk[:, 0]))
+        if len(keys) > SAMPLE_SIZE:
+            keep = np.argpartition(keys, SAMPLE_SIZE)[:SAMPLE_SIZE]
+            keys = keys[keep]
+            xs = xs[keep]
+    return n, dim, np.sort(xs)
+
+
+def _solve(pts, best):
+    """Closest pair of pts (an in-memory array) folded into best = (d, p, q)"""
+    if len(pts) < 2:
+        return best
+    if pts.shape[1] == 2:
+        d, i, j = closest_pair_numpy_indices(pts)
+    else:
+        d, i, j = closest_pair_nd_indices(pts)
+    if d < best[0]:
+        best = (d, tuple(pts[i].tolist()), tuple(pts[j].tolist()))
+    return best
+
+
+def closest_pair_external(path, chunk_size=1_000_000, tmpdir=None, seed=None):
+    """Closest pair of a point file that may not fit in memory.
+
+    1. Stream the file once to count the points and sample x values.
+    2. Cut the x axis at sample quantiles into slabs of about chunk_size
+       points and stream the file again, appending each point to its slab's
+       temporary raw float64 file.
+    3. Solve every slab on its own in memory (NumPy engine, or the
+       d-dimensional engine for points with more than two coordinates);
+       d is the best distance found.
+    4. For every slab boundary b, gather the points with |x - b| < d from the
+       slabs that reach into that strip and solve the strip. Any closer pair
+       crosses some boundary and has both points inside its strip.
+
+    Peak memory is about one slab (plus the strips), i.e. O(chunk_size) for
+    inputs without long runs of equal x values.
+    Returns (min_dist, pair) like closest_pair().
+    """
+    rng = np.random.default_rng(seed)
+    n, dim, sample = _sample_x(path, chunk_size, rng)
+    if n < 2:
+        return None, None
+
+    slabs = max(1, math.ceil(n / chunk_size))
+    # inner boundaries; slab k holds bounds[k-1] <= x < bounds[k]
+    bounds = np.unique(np.quantile(sample, np.arange(1, slabs) / slabs)) if slabs > 1 else np.empty(0)
+    slabs = len(bounds) + 1
+
+    best = (math.inf, None, None)
+    with tempfile.TemporaryDirectory(dir=tmpdir) as tmp:
+        names = [os.path.join(tmp, f"slab_{k}.f64") for k in range(slabs)]
+        files = [open(name, "wb") for name in names]
+        try:
+            for chunk in iter_point_chunks(path, chunk_size):
+                slab_of = np.searchsorted(bounds, chunk[:, 0], side="right")
+                order = np.argsort(slab_of, kind="stable")
+                cuts = np.searchsorted(slab_of[order], np.arange(slabs + 1))
+                for k in range(slabs):
+                    if cuts[k] < cuts[k + 1]:
+                        chunk[order[cuts[k]:cuts[k + 1]]].astype("<f8").tofile(files[k])
+        finally:
+            for f in files:
+                f.close()
+
+        def slab(k):
+            if os.path.getsize(names[k]) == 0:
+                return np.empty((0, dim))
+            return np.memmap(names[k], dtype="<f8", mode="r").reshape(-1, dim)
+
+        for k in range(slabs):
+            best = _solve(np.array(slab(k)), best)
+            if best[0] == 0:
+                return 0.0, (best[1], best[2])
+
+        # boundary strips of width best[0] on each side
+        edges = np.concatenate(([-math.inf], bounds, [math.inf]))
+        for b in bounds:
+            d = best[0]
+            parts = []
+            for k in range(slabs):
+                if edges[k + 1] <= b - d or edges[k] >= b + d:
+                    continue
+                pts = slab(k)
+                parts.append(np.array(pts[np.abs(pts[:, 0] - b) < d]))
+            best = _solve(np.concatenate(parts) if parts else np.empty((0, dim)), best)
+
+    return best[0], (best[1], best[2])
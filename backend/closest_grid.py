@@ -0,0 +1,172 @@
+import heapq
+import math
+import random
+
+# Subproblems at or below this size are solved by brute force
+BASE_CASE = 64
+
+# Neighbour cells visited from each cell; the other four are covered when the
+# scan reaches the neighbour itself, so every pair of cells is checked once
+HALF_NEIGHBOURS = [(1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+def _check_2d(points):
+    # cells and distances use x and y only; other dimensions go to closest_nd
+    if len(points) and len(points[0]) != 2:
+        raise ValueError(f"The grid algorithms need 2-D points, got {len(points[0])} coordinates")
+
+
+def _brute_force(points, idx):
+    best = math.inf
+    a = b = -1
+    for u in range(len(idx)):
+        p = points[idx[u]]
+        for v in range(u + 1, len(idx)):
+            q = points[idx[v]]
+            cur = math.hypot(p[0] - q[0], p[1] - q[1])
+            if cur < best:
+                best, a, b = cur, idx[u], idx[v]
+    return best, (a, b)
+
+
+def _grid_rec(points, idx, rng):
+    n = len(idx)
+    if n <= BASE_CASE:
+        return _brute_force(points, idx)
+
+    # Closest distance of a random n^(2/3) sample is an upper bound d on the
+    # answer; with cells of side d the answer lies in the same or adjacent cells
+    sample = rng.sample(idx, int(n ** (2 / 3)))
+    d, (a, b) = _grid_rec(points, sample, rng)
+    if d == 0:
+        return d, (a, b)
+
+    grid = {}
+    for i in idx:
+        p = points[i]
+        grid.setdefault((int(p[0] // d), int(p[1] // d)), []).append(i)
+
+    # d only shrinks from here on; the cell size stays valid as an upper bound
+    hypot = math.hypot
+    for (cx, cy), cell in grid.items():
+        m = len(cell)
+        for u in range(m):
+            p = points[cell[u]]
+            for v in range(u + 1, m):
+                q = points[cell[v]]
+                cur = hypot(p[0] - q[0], p[1] - q[1])
+                if cur < d:
+                    d, a, b = cur, cell[u], cell[v]
+        for dx, dy in HALF_NEIGHBOURS:
+            other = grid.get((cx + dx, cy + dy))
+            if other:
+                for i in cell:
+                    p = points[i]
+                    for j in other:
+                        q = points[j]
+                        cur = hypot(p[0] - q[0], p[1] - q[1])
+                        if cur < d:
+                            d, a, b = cur, i, j
+    return d, (a, b)
+
+
+def closest_pair_grid(points, seed=None):
+    """Randomized grid closest pair (Rabin's algorithm), expected O(n) for any input.
+
+    The closest distance d of a random sample of n^(2/3) points (found the
+    same way) sets the cell size, every point is bucketed into a hash grid,
+    and only pairs in the same or adjacent cells are compared while d is
+    refined. Rabin showed the expected number of such pairs is O(n).
+
+    Returns (min_dist, (i, j)) with i, j indices into points.
+    """
+    _check_2d(points)
+    return _grid_rec(points, list(range(len(points))), random.Random(seed))
+
+
+def pairs_within_grid(points, r):
+    """Yield (dist, i, j) for every pair of points at distance <= r.
+
+    Points are bucketed into cells of side r, so only the same and adjacent
+    cells are compared: O(n + output) work for evenly spread points.
+    """
+    _check_2d(points)
+    if r < 0:
+        return
+    grid = {}
+    if r == 0:
+        # only identical points qualify: bucket by the point itself
+        for i, p in enumerate(points):
+            grid.setdefault((p[0], p[1]), []).append(i)
+        for cell in grid.values():
+            for u in range(len(cell)):
+                for v in range(u + 1, len(cell)):
+                    yield 0.0, cell[u], cell[v]
+        return
+
+    for i, p in enumerate(points):
+        grid.setdefault((int(p[0] // r), int(p[1] // r)), []).append(i)
+
+    hypot = math.hypot
+    for (cx, cy), cell in grid.items():
+        m = len(cell)
+        for u in range(m):
+            p = points[cell[u]]
+            for v in range(u + 1, m):
+                q = points[cell[v]]
+                cur = hypot(p[0] - q[0], p[1] - q[1])
+                if cur <= r:
+                    yield cur, cell[u], cell[v]
+        for dx, dy in HALF_NEIGHBOURS:
+            other = grid.get((cx + dx, cy + dy))
+            if other:
+                for i in cell:
+                    p = points[i]
+                    for j in other:
+                        q = points[j]
+                        cur = hypot(p[0] - q[0], p[1] - q[1])
+                        if cur <= r:
+                            yield cur, i, j
+
+
+def k_closest_grid(points, k, seed=None):
+    """The k closest pairs as a list of (dist, i, j), nearest first.
+
+    Starts from the closest distance and widens a search radius r until
+    at least k pairs lie within r; a size-k heap keeps only the best pairs
+    seen, so memory is O(n + k) whatever the number of pairs inside r.
+    """
+    _check_2d(points)
+    n = len(points)
+    total = n * (n - 1) // 2
+    k = min(k, total)
+    if k <= 0:
+        return []
+
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    diameter = math.hypot(max(xs) - min(xs), max(ys) - min(ys))
+    r, _ = closest_pair_grid(points, seed)
+    if r == 0:
+        found = _k_smallest(pairs_within_grid(points, 0.0), k)
+        if len(found) >= k or diameter == 0:
+            return found
+        r = diameter / n
+
+    while True:
+        found = _k_smallest(pairs_within_grid(points, r), k)
+        if len(found) >= k or r >= diameter:
+            return found
+        # pair counts grow roughly with r**2: aim straight past k
+        r *= max(2.0, 1.25 * math.sqrt(k / max(len(found), 1)))
+
+
+def _k_smallest(pairs, k):
+    """Bounded max-heap selection of the k smallest (dist, i, j) items"""
+    heap = []
+    for d, i, j in pairs:
+        if len(heap) < k:
+            heapq.heappush(heap, (-d, i, j))
+        elif d < -heap[0][0]:
+            heapq.heapreplace(heap, (-d, i, j))
+    return sorted((-nd, i, j) for nd, i, j in heap)
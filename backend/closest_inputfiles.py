@@ -1,15 +1,59 @@
-import random
+import argparse
 import os
 
-os.makedirs("closest_inputs", exist_ok=True)
-
-for i in range(1, 11):
-    filename = f"closest_inputs/closest_input_{i}.txt"
-    with open(filename, "w") as f:
-        n = random.randint(100, 300)   # at least 100 points
-        f.write(str(n) + "\n")
-        for _ in range(n):
-            x = random.randint(0, 1000)
-            y = random.randint(0, 1000)
-            f.write(f"{x} {y}\n")
-    print(f"Created {filename} with {n} points.")
+import numpy as np
+
+# Point layouts generate_points can draw
+DISTRIBUTIONS = ("uniform", "clustered", "duplicates", "collinear")
+
+
+def generate_points(n, dist="uniform", seed=None, bound=1000):
+    """(n, 2) float64 array of integer points in [0, bound] x [0, bound].
+
+    uniform: independent coordinates; clustered: ten gaussian blobs;
+    duplicates: drawn from a pool of n // 100 points, so most points repeat;
+    collinear: every point on the anti-diagonal x + y = bound.
+    """
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {dist!r}, expected one of {DISTRIBUTIONS}")
+    rng = np.random.default_rng(seed)
+    if dist == "clustered":
+        centers = rng.uniform(0, bound, size=(10, 2))
+        pts = centers[rng.integers(0, len(centers), n)] + rng.normal(0, bound / 100, size=(n, 2))
+        pts = np.clip(np.rint(pts), 0, bound)
+    elif dist == "duplicates":
+        pool = rng.integers(0, bound + 1, size=(max(2, n // 100), 2))
+        pts = pool[rng.integers(0, len(pool), n)]
+    elif dist == "collinear":
+        x = rng.integers(0, bound + 1, n)
+        pts = np.column_stack((x, bound - x))
+    else:
+        pts = rng.integers(0, bound + 1, size=(n, 2))
+    return pts.astype(np.float64)
+
+
+def write_points_file(path, points):
+    """Write points in the input format: the count, then one "x y" line per point"""
+    with open(path, "w") as f:
+        f.write(f"{len(points)}\n")
+        np.savetxt(f, points, fmt="%d")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate closest pair input files")
+    parser.add_argument('--files', type=int, default=10, help='number of files to write')
+    parser.add_argument('--min-n', type=int, default=100, help='fewest points per file')
+    parser.add_argument('--max-n', type=int, default=300, help='most points per file')
+    parser.add_argument('--dist', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--bound', type=int, default=1000, help='coordinates are integers in [0, bound]')
+    parser.add_argument('--seed', type=int, default=None, help='seed for reproducible files')
+    parser.add_argument('--out-dir', default='closest_inputs')
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+    for i in range(1, args.files + 1):
+        filename = os.path.join(args.out_dir, f"closest_input_{i}.txt")
+        n = int(rng.integers(args.min_n, args.max_n + 1))
+        write_points_file(filename, generate_points(n, args.dist, rng, args.bound))
+        print(f"Created {filename} with {n} points.")
@@ -0,0 +1,161 @@
+import itertools
+
+import numpy as np
+
+# Up to this many dimensions the grid is used; above it the 3^d neighbour
+# cells cost more than a blocked brute force
+GRID_MAX_DIM = 6
+
+# Subproblems at or below this size (or below CELL_COST * 3^d, where the
+# neighbour passes cost more than comparing everything) use brute force
+BASE_CASE = 512
+CELL_COST = 8
+
+# Rows per block in the brute force and point pairs per batch in the grid scan
+BLOCK = 1024
+PAIR_BATCH = 1 << 20
+
+
+def as_nd_array(points):
+    """Return points as a contiguous (n, d) float64 array (no copy if already one)"""
+    arr = np.ascontiguousarray(points, dtype=np.float64)
+    if arr.ndim != 2:
+        arr = arr.reshape(len(arr), -1)
+    return arr
+
+
+def _brute_force(pts):
+    """(d2, i, j) of pts by comparing every pair, one block of rows at a time.
+
+    Squared distances come from |a|^2 + |b|^2 - 2 a.b (one matrix product per
+    block). That form loses precision, so every pair it puts within the error
+    bound of the best candidate is re-measured exactly.
+    """
+    n = len(pts)
+    centered = pts - pts.mean(axis=0)
+    norms = np.einsum('ij,ij->i', centered, centered)
+    # bound on the rounding error of the expanded form for any pair
+    slack = 16 * np.finfo(np.float64).eps * pts.shape[1] * 2 * float(norms.max())
+    best, a, b = np.inf, -1, -1
+    for r0 in range(0, n, BLOCK):
+        r1 = min(n, r0 + BLOCK)
+        for c0 in range(r0, n, BLOCK):
+            c1 = min(n, c0 + BLOCK)
+            approx = norms[r0:r1, None] + norms[None, c0:c1] - 2 * centered[r0:r1] @ centered[c0:c1].T
+            if c0 == r0:
+                # diagonal block: only pairs with row < column
+                approx[np.tril_indices(r1 - r0, 0, c1 - c0)] = np.inf
+            u, v = np.nonzero(approx <= min(best, float(approx.min()) + slack) + slack)
+            if len(u) == 0:
+                continue
+            diff = pts[r0 + u] - pts[c0 + v]
+            d2 = np.einsum('ij,ij->i', diff, diff)
+            k = int(np.argmin(d2))
+            if d2[k] < best:
+                best, a, b = float(d2[k]), r0 + int(u[k]), c0 + int(v[k])
+    return best, a, b
+
+
+def _half_offsets(dim):
+    """Neighbour cell offsets whose first non-zero entry is positive (one of each +/- pair)"""
+    return [o for o in itertools.product((-1, 0, 1), repeat=dim)
+            if any(o) and next(v for v in o if v) > 0]
+
+
+def _row_keys(cells):
+    """One sortable byte-string key per row of non-negative int64 cell coordinates"""
+    big = np.ascontiguousarray(cells, dtype='>i8')
+    return big.view(f"V{8 * cells.shape[1]}").ravel()
+
+
+def _scan(pts, order, a_start, a_count, b_start, b_count, best):
+    """Compare every point of cell A with every point of cell B for each (A, B) pair.
+
+    Cells are runs order[start:start + count]; when A and B are the same
+    cell only pairs with u < v are compared. Work is batched so at most
+    about PAIR_BATCH point pairs are materialized at once.
+    """
+    same = a_start is b_start
+    sizes = a_count * b_count
+    ends = np.cumsum(sizes)
+    first = 0
+    while first < len(sizes):
+        last = int(np.searchsorted(ends, ends[first] - sizes[first] + PAIR_BATCH, side="right"))
+        last = max(last, first + 1)
+        sz = sizes[first:last]
+        cell = np.repeat(np.arange(first, last), sz)
+        t = np.arange(int(sz.sum())) - np.repeat(np.cumsum(sz) - sz, sz)
+        u = t // b_count[cell]
+        v = t % b_count[cell]
+        if same:
+            keep = u < v
+            cell, u, v = cell[keep], u[keep], v[keep]
+        if len(cell):
+            i = order[a_start[cell] + u]
+            j = order[b_start[cell] + v]
+            diff = pts[i] - pts[j]
+            d2 = np.einsum('ij,ij->i', diff, diff)
+            k = int(np.argmin(d2))
+            if d2[k] < best[0]:
+                best = (float(d2[k]), int(i[k]), int(j[k]))
+        first = last
+    return best
+
+
+def _grid(pts, rng):
+    """(d2, i, j) with Rabin's sampled grid generalized to d dimensions"""
+    n, dim = pts.shape
+    if n <= max(BASE_CASE, CELL_COST * 3 ** dim):
+        return _brute_force(pts)
+
+    # Closest distance of a random n^(2/3) sample bounds the answer; with cells
+    # of that side the answer lies in the same or an adjacent cell
+    sample = rng.choice(n, int(n ** (2 / 3)), replace=False)
+    d2, a, b = _grid(pts[sample], rng)
+    best = (d2, int(sample[a]), int(sample[b]))
+    if d2 == 0:
+        return best
+    side = float(np.sqrt(d2))
+
+    cells = np.floor((pts - pts.min(axis=0)) / side).astype(np.int64)
+    keys = _row_keys(cells)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    ucells = cells[order[starts]]
+    ukeys = sorted_keys[starts]
+
+    best = _scan(pts, order, starts, counts, starts, counts, best)
+    for off in _half_offsets(dim):
+        target = ucells + np.array(off, dtype=np.int64)
+        valid = np.all(target >= 0, axis=1)
+        src = np.flatnonzero(valid)
+        tkeys = _row_keys(target[src])
+        pos = np.searchsorted(ukeys, tkeys)
+        pos[pos == len(ukeys)] = 0
+        hit = ukeys[pos] == tkeys
+        src, pos = src[hit], pos[hit]
+        if len(src):
+            best = _scan(pts, order, starts[src], counts[src], starts[pos], counts[pos], best)
+    return best
+
+
+def closest_pair_nd_indices(points, seed=None):
+    """Closest pair of points in any number of dimensions as (min_dist, i, j).
+
+    Up to GRID_MAX_DIM dimensions this runs Rabin's randomized grid
+    (expected O(3^d n) pair checks): a sample's closest distance sets the
+    cell size and only points in the same or adjacent cells are compared,
+    all with vectorized numpy batches. Higher dimensions use a blocked brute
+    force built on matrix products, which beats the exponential number of
+    neighbour cells there.
+    """
+    pts = as_nd_array(points)
+    if len(pts) < 2:
+        return None, None, None
+    if pts.shape[1] <= GRID_MAX_DIM:
+        d2, i, j = _grid(pts, np.random.default_rng(seed))
+    else:
+        d2, i, j = _brute_force(pts)
+    return float(np.sqrt(d2)), i, j
@@ -0,0 +1,96 @@
+import numpy as np
+
+# Subproblems at or below this size are solved with one pairwise distance block
+BASE_CASE = 64
+
+
+def as_point_array(points):
+    """Return points as a contiguous (n, 2) float64 array (no copy if already one)"""
+    arr = np.ascontiguousarray(points, dtype=np.float64)
+    if arr.ndim != 2 or arr.shape[1] != 2:
+        arr = arr.reshape(-1, 2)
+    return arr
+
+
+def _brute_force(x, y, idx):
+    """Closest pair among the points idx by checking every pair at once"""
+    i, j = np.triu_indices(len(idx), 1)
+    dx = x[idx[i]] - x[idx[j]]
+    dy = y[idx[i]] - y[idx[j]]
+    dd = dx * dx + dy * dy
+    k = int(np.argmin(dd))
+    return float(dd[k]), int(idx[i[k]]), int(idx[j[k]])
+
+
+def _strip_check(x, y, strip, best):
+    """Batched strip scan: compare every strip point with its k-th y-successor"""
+    d2, a, b = best
+    xs = x[strip]
+    ys = y[strip]
+    k = 1
+    while k < len(strip):
+        d = np.sqrt(d2)
+        dy = ys[k:] - ys[:-k]
+        active = np.flatnonzero(dy < d)
+        if len(active) == 0:
+            break
+        dx = xs[k:][active] - xs[:-k][active]
+        dd = dx * dx + dy[active] * dy[active]
+        m = int(np.argmin(dd))
+        if dd[m] < d2:
+            d2 = float(dd[m])
+            a, b = int(strip[active[m]]), int(strip[active[m] + k])
+        k += 1
+    return d2, a, b
+
+
+def _closest_rec(x, y, px, rank, lo, hi, py):
+    """D&C on x-order positions [lo, hi); py holds the same points in y order"""
+    n = hi - lo
+    if n <= BASE_CASE:
+        return _brute_force(x, y, px[lo:hi])
+
+    mid = lo + n // 2
+    midx = x[px[mid]]
+
+    # Split the y order with a rank mask instead of rebuilding point sets
+    is_left = rank[py] < mid
+    left = _closest_rec(x, y, px, rank, lo, mid, py[is_left])
+    right = _closest_rec(x, y, px, rank, mid, hi, py[~is_left])
+    best = left if left[0] < right[0] else right
+    if best[0] == 0.0:
+        return best
+
+    strip = py[np.abs(x[py] - midx) < np.sqrt(best[0])]
+    if len(strip) < 2:
+        return best
+    return _strip_check(x, y, strip, best)
+
+
+def closest_pair_numpy_indices(points):
+    """Vectorized divide-and-conquer closest pair; returns (min_dist, i, j) row indices"""
+    pts = as_point_array(points)
+    n = len(pts)
+
+    x = pts[:, 0]
+    y = pts[:, 1]
+    px = np.lexsort((y, x))
+    py = np.lexsort((x, y))
+    rank = np.empty(n, dtype=np.intp)
+    rank[px] = np.arange(n)
+
+    d2, a, b = _closest_rec(x, y, px, rank, 0, n, py)
+    return float(np.sqrt(d2)), a, b
+
+
+def closest_pair_numpy(points):
+    """Vectorized divide-and-conquer closest pair on an (n, 2) float64 array.
+
+    Returns (min_dist, pair) exactly like closest_pair in closest_pair.py.
+    """
+    pts = as_point_array(points)
+    if len(pts) < 2:
+        return None, None
+    d, a, b = closest_pair_numpy_indices(pts)
+    pair = ((float(pts[a, 0]), float(pts[a, 1])), (float(pts[b, 0]), float(pts[b, 1])))
+    return d, pair
@@ -1,182 +1,287 @@
-import math
+import os
+import sys
 import time
-import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
-import matplotlib.pyplot as plt
+from array import array
 
-def read_points_from_file(path):
-    pts = []
-    with open(path) as f:
-        first = f.readline().strip()
-        # if first line is integer, treat as count
-        try:
-            n = int(first)
-            for _ in range(n):
-                line = f.readline().strip()
-                if not line:
-                    break
-                x, y = map(float, line.split())
-                pts.append((x, y))
-        except:
-            # first line wasn't integer: treat it as a point
-            if first:
-                x, y = map(float, first.split())
-                pts.append((x, y))
-            for line in f:
-                if line.strip():
-                    x, y = map(float, line.split())
-                    pts.append((x, y))
-    return pts
+if __package__ in (None, ""):
+    # running as `python backend/closest_pair.py`: make the backend package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.trace import (
+    Trace, point_tuple, SETUP, LEVEL, BASE_CASE, BRUTE_MIN, BRUTE_RESULT, DIVIDE, CONQUER_LEFT,
+    CONQUER_RIGHT, COMBINE, TAKE_LEFT, TAKE_RIGHT, DUPLICATE, STRIP, STRIP_SIZE,
+    STRIP_MIN, STRIP_DONE, FINAL, NOTE,
+)
+
+from backend.closest_grid import closest_pair_grid, k_closest_grid, pairs_within_grid
+from backend.metrics import METRICS, get_metric
+from backend.records import FORMATS, RecordWriter
 
-def dist(a, b):
-    return math.hypot(a[0]-b[0], a[1]-b[1])
+ENGINES = ("python", "numpy")
+ALGORITHMS = ("dc", "grid")
 
-# Brute force for small n
-def brute_force(points, steps=None):
+def read_points_from_file(path):
+    """Read points as a list of (x, y) tuples (text, .npy or raw float64 files)"""
+    from backend.point_io import load_points
+    return list(map(tuple, load_points(path).tolist()))
+
+# Brute force over point indices; returns (distance, (i, j))
+def brute_force_idx(points, idx, depth=0, trace=None, metric=METRICS["euclidean"]):
     min_d = float('inf')
     pair = (None, None)
-    n = len(points)
-    if steps is not None:
-        steps.append(f"  Brute force on {n} points: {points}")
+    n = len(idx)
+    dist = metric.dist
     
-    for i in range(n):
-        for j in range(i+1, n):
+    for u in range(n):
+        i = idx[u]
+        for v in range(u+1, n):
+            j = idx[v]
             d = dist(points[i], points[j])
             if d < min_d:
                 min_d = d
-                pair = (points[i], points[j])
-                if steps is not None:
-                    steps.append(f"    New min distance: {min_d:.4f} between {points[i]} and {points[j]}")
+                pair = (i, j)
+                if trace is not None:
+                    trace.emit(BRUTE_MIN, depth, i, j, d=d)
     
-    if steps is not None:
-        steps.append(f"  Brute force result: distance = {min_d:.4f}")
+    if trace is not None:
+        trace.emit(BRUTE_RESULT, depth, d=min_d)
     return min_d, pair
 
-# Main D&C recursive function with step tracking
-def closest_pair_rec(px, py, depth=0, steps=None):
-    indent = "  " * depth
-    n = len(px)
+# Main D&C recursive function with step tracing. Works on point indices held
+# in array('q') buffers: px is the x order, rank[i] the position of point i in
+# px, [lo, hi) the slice of px handled by this call and py[lo:hi] the same
+# points in y order. strip is scratch space for the strip (allocated on the
+# first call). metric supplies the distance and the strip pruning bounds.
+# Returns (distance, (i, j)).
+def closest_pair_rec_idx(points, px, py, rank, lo, hi, depth=0, trace=None, metric=METRICS["euclidean"],
+                         strip=None):
+    n = hi - lo
+    if strip is None:
+        strip = array('q', bytes(8 * len(px)))
     
-    if steps is not None:
-        steps.append(f"{indent}Level {depth}: Processing {n} points")
+    if trace is not None:
+        trace.emit(LEVEL, depth, n=n)
     
     # Base case
     if n <= 3:
-        if steps is not None:
-            steps.append(f"{indent}Base case reached (n <= 3), using brute force")
-        return brute_force(px, steps)
+        if trace is not None:
+            trace.emit(BASE_CASE, depth, lo, hi)
+        return brute_force_idx(points, px[lo:hi], depth, trace, metric)
     
     # DIVIDE PHASE
-    mid = n // 2
-    midx = px[mid][0]
-    
-    if steps is not None:
-        steps.append(f"{indent}DIVIDE: Splitting at x = {midx:.2f}")
-        steps.append(f"{indent}  Left half: {len(px[:mid])} points")
-        steps.append(f"{indent}  Right half: {len(px[mid:])} points")
+    mid = lo + n // 2
+    midx = points[px[mid]][0]
     
-    Qx = px[:mid]
-    Rx = px[mid:]
+    if trace is not None:
+        trace.emit(DIVIDE, depth, mid - lo, hi - mid, x=midx)
     
-    # Maintain y-sorted lists for left/right
-    Qy = []
-    Ry = []
-    left_set = set(Qx)
-    for p in py:
-        if p in left_set:
-            Qy.append(p)
+    # Split the y order by x-rank, in place: a point is on the left iff its rank
+    # < mid, so duplicates straddling the split still land on exactly one side.
+    # The halves reorder py[lo:hi] as they recurse; this level keeps its y order
+    # in one unboxed copy for the strip
+    ys = py[lo:hi]
+    left, right = lo, mid
+    for i in ys:
+        if rank[i] < mid:
+            py[left] = i
+            left += 1
         else:
-            Ry.append(p)
+            py[right] = i
+            right += 1
     
     # CONQUER PHASE (Recursive calls)
-    if steps is not None:
-        steps.append(f"{indent}CONQUER: Recursively solving left half")
-    dl, pair_l = closest_pair_rec(Qx, Qy, depth + 1, steps)
+    if trace is not None:
+        trace.emit(CONQUER_LEFT, depth)
+    dl, pair_l = closest_pair_rec_idx(points, px, py, rank, lo, mid, depth + 1, trace, metric, strip)
     
-    if steps is not None:
-        steps.append(f"{indent}CONQUER: Recursively solving right half")
-    dr, pair_r = closest_pair_rec(Rx, Ry, depth + 1, steps)
+    if dl == 0:
+        # duplicate points: nothing can beat distance 0
+        if trace is not None:
+            trace.emit(DUPLICATE, depth)
+        return dl, pair_l
+    
+    if trace is not None:
+        trace.emit(CONQUER_RIGHT, depth)
+    dr, pair_r = closest_pair_rec_idx(points, px, py, rank, mid, hi, depth + 1, trace, metric, strip)
     
     # COMBINE PHASE
-    if steps is not None:
-        steps.append(f"{indent}COMBINE: Comparing results from left and right")
-        steps.append(f"{indent}  Left min distance: {dl:.4f}")
-        steps.append(f"{indent}  Right min distance: {dr:.4f}")
+    if trace is not None:
+        trace.emit(COMBINE, depth, x=dl, d=dr)
     
     if dl < dr:
         d = dl
         pair = pair_l
-        if steps is not None:
-            steps.append(f"{indent}  Taking left result (smaller distance)")
+        if trace is not None:
+            trace.emit(TAKE_LEFT, depth)
     else:
         d = dr
         pair = pair_r
-        if steps is not None:
-            steps.append(f"{indent}  Taking right result (smaller distance)")
+        if trace is not None:
+            trace.emit(TAKE_RIGHT, depth)
+    
+    if d == 0:
+        if trace is not None:
+            trace.emit(DUPLICATE, depth)
+        return d, pair
     
     # Check strip around midline
-    if steps is not None:
-        steps.append(f"{indent}Checking strip around midline x = {midx:.2f} ± {d:.4f}")
+    if trace is not None:
+        trace.emit(STRIP, depth, x=midx, d=d)
     
-    strip = [p for p in py if abs(p[0] - midx) < d]
-    strip_len = len(strip)
+    xr = metric.x_reach(d)
+    strip_len = 0
+    for i in ys:
+        if abs(points[i][0] - midx) < xr:
+            strip[strip_len] = i
+            strip_len += 1
     
-    if steps is not None:
-        steps.append(f"{indent}  Strip contains {strip_len} points")
+    if trace is not None:
+        trace.emit(STRIP_SIZE, depth, n=strip_len)
     
-    # Check combinations in strip
+    # Check combinations in strip; yr bounds the y gap of any closer pair
+    dist = metric.dist
+    yr = metric.y_reach(d, midx)
     strip_improved = False
-    for i in range(strip_len):
-        j = i + 1
-        while j < strip_len and (strip[j][1] - strip[i][1]) < d:
-            curd = dist(strip[i], strip[j])
+    for u in range(strip_len):
+        p = points[strip[u]]
+        v = u + 1
+        while v < strip_len and (points[strip[v]][1] - p[1]) < yr:
+            curd = dist(p, points[strip[v]])
             if curd < d:
                 d = curd
-                pair = (strip[i], strip[j])
+                yr = metric.y_reach(d, midx)
+                pair = (strip[u], strip[v])
                 strip_improved = True
-                if steps is not None:
-                    steps.append(f"{indent}  🎯 New closest pair in strip: {strip[i]} and {strip[j]}")
-                    steps.append(f"{indent}  New min distance: {d:.4f}")
-            j += 1
+                if trace is not None:
+                    trace.emit(STRIP_MIN, depth, strip[u], strip[v], d=d)
+            v += 1
     
-    if steps is not None:
-        if strip_improved:
-            steps.append(f"{indent}✓ Strip check improved the result")
-        else:
-            steps.append(f"{indent}  Strip check didn't improve result")
-        steps.append(f"{indent}Final result at level {depth}: distance = {d:.4f}")
+    if metric.period:
+        # y wraps around (longitudes): pair the top of the strip with the bottom
+        u = strip_len - 1
+        while u > 0 and points[strip[0]][1] + metric.period - points[strip[u]][1] < yr:
+            p = points[strip[u]]
+            v = 0
+            while v < u and points[strip[v]][1] + metric.period - p[1] < yr:
+                curd = dist(p, points[strip[v]])
+                if curd < d:
+                    d = curd
+                    yr = metric.y_reach(d, midx)
+                    pair = (strip[u], strip[v])
+                    strip_improved = True
+                    if trace is not None:
+                        trace.emit(STRIP_MIN, depth, strip[u], strip[v], d=d)
+                v += 1
+            u -= 1
+    
+    if trace is not None:
+        trace.emit(STRIP_DONE, depth, n=int(strip_improved), d=d)
     
     return d, pair
 
-def closest_pair(points, steps=None):
+def sort_indices(points):
+    """Return (px, py, rank): point indices in (x, y) and (y, x) order and each point's x-rank, as array('q')"""
+    import numpy as np
+    xy = np.array(points, dtype=np.float64)
+    # stable sorts: px is (x, y, index) order and py re-sorts it by y, giving (y, x, index)
+    px = np.lexsort((xy[:, 1], xy[:, 0]))
+    py = px[np.argsort(xy[px, 1], kind="stable")]
+    rank = np.empty_like(px)
+    rank[px] = np.arange(len(px))
+    return tuple(array('q', a.astype(np.int64).tobytes()) for a in (px, py, rank))
+
+def closest_pair(points, steps=None, engine="python", algorithm="dc", workers=1, metric="euclidean"):
+    """Closest pair of points as (min_dist, pair).
+
+    algorithm is "dc" (divide and conquer, run by the chosen engine) or
+    "grid" (randomized expected O(n) grid search, pure Python).
+    workers > 1 runs the divide and conquer on the NumPy engine with the top
+    recursion levels spread over a process pool.
+    Points with other than two coordinates go to the d-dimensional engine
+    (closest_nd) whatever the engine and algorithm.
+    metric is a name from backend.metrics.METRICS (euclidean, sqeuclidean,
+    manhattan, chebyshev, haversine on (lat, lon) degrees, in km); metrics
+    other than euclidean run on the python divide and conquer.
+    steps may be a Trace (events are recorded, text is rendered on demand)
+    or a list, which receives the rendered lines once the run is finished.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}")
+    metric = get_metric(metric)
+    if metric.name != "euclidean" and (engine != "python" or algorithm != "dc" or workers > 1):
+        raise ValueError(f"Metric {metric.name!r} is only supported by the python divide and conquer engine")
     if len(points) < 2:
         return None, None
+    if metric.name != "euclidean" and len(points[0]) != 2:
+        raise ValueError(f"Metric {metric.name!r} needs 2-D points")
     
-    if steps is not None:
-        steps.append("Initial setup:")
-        steps.append(f"  Total points: {len(points)}")
-        steps.append("  Sorting points by x-coordinate...")
-    
-    px = sorted(points, key=lambda p: (p[0], p[1]))
-    
-    if steps is not None:
-        steps.append("  Sorting points by y-coordinate...")
-    
-    py = sorted(points, key=lambda p: (p[1], p[0]))
-    
-    if steps is not None:
-        steps.append("Starting divide-and-conquer algorithm...")
-        steps.append("=" * 50)
+    trace = steps
+    if isinstance(steps, list):
+        trace = Trace()
     
-    min_dist, pair = closest_pair_rec(px, py, 0, steps)
-    
-    if steps is not None:
-        steps.append("=" * 50)
-        steps.append(f"FINAL RESULT:")
-        steps.append(f"  Closest pair: {pair[0]} and {pair[1]}")
-        steps.append(f"  Minimum distance: {min_dist:.6f}")
+    if len(points[0]) != 2:
+        from backend.closest_nd import closest_pair_nd_indices
+        min_dist, i, j = closest_pair_nd_indices(points)
+        if trace is not None:
+            trace.bind(points)
+            trace.emit(NOTE, a=3)
+    elif algorithm == "grid":
+        min_dist, (i, j) = closest_pair_grid(points)
+        if trace is not None:
+            trace.bind(points)
+            trace.emit(NOTE, a=1)
+    elif workers > 1:
+        from backend.closest_parallel import closest_pair_parallel_indices
+        min_dist, i, j = closest_pair_parallel_indices(points, workers)
+        if trace is not None:
+            trace.bind(points)
+            trace.emit(NOTE, a=2)
+    elif engine == "numpy":
+        from backend.closest_numpy import closest_pair_numpy_indices
+        min_dist, i, j = closest_pair_numpy_indices(points)
+        if trace is not None:
+            trace.bind(points)
+            trace.emit(NOTE, a=0)
+    else:
+        if not isinstance(points, (list, tuple)):
+            # NumPy rows do not compare as (x, y) keys and are slow to index one by one
+            points = list(map(tuple, points.tolist())) if hasattr(points, "tolist") else list(points)
+        px, py, rank = sort_indices(points)
+        if trace is not None:
+            trace.bind(points, px)
+            trace.emit(SETUP, n=len(points))
+        min_dist, (i, j) = closest_pair_rec_idx(points, px, py, rank, 0, len(points), 0, trace, metric)
     
-    return min_dist, pair
+    if trace is not None:
+        trace.emit(FINAL, 0, i, j, d=min_dist)
+        if isinstance(steps, list):
+            steps.extend(trace)
+    return min_dist, (point_tuple(points, i), point_tuple(points, j))
+
+def k_closest_pairs(points, k):
+    """Generate the k closest pairs of 2-D points as (dist, (p, q)), nearest first"""
+    for d, i, j in k_closest_grid(points, k):
+        yield d, (point_tuple(points, i), point_tuple(points, j))
+
+def pairs_within(points, r):
+    """Generate every pair of 2-D points at distance <= r as (dist, (p, q)), in no particular order"""
+    for d, i, j in pairs_within_grid(points, r):
+        yield d, (point_tuple(points, i), point_tuple(points, j))
+
+# Columns of --format csv
+RECORD_FIELDS = ["file", "n", "distance", "pair", "elapsed"]
+
+def result_record(path, n, d, pair, elapsed=None):
+    """One --format json/csv/ndjson record of a closest pair run"""
+    return {
+        "file": path,
+        "n": n,
+        "distance": d,
+        "pair": [[float(v) for v in p] for p in pair] if pair and d is not None else None,
+        "elapsed": elapsed,
+    }
 
 def format_steps(steps):
     return "\n".join(steps)
@@ -188,10 +293,42 @@ if __name__ == "__main__":
     parser.add_argument('--file', help='input file path', default=None)
     parser.add_argument('--gui', action='store_true', help='open GUI')
     parser.add_argument('--steps', action='store_true', help='show step-by-step process')
+    parser.add_argument('--engine', choices=ENGINES, default='python',
+                        help='closest pair engine (numpy = vectorized array engine)')
+    parser.add_argument('--algorithm', choices=ALGORITHMS, default='dc',
+                        help='dc = divide and conquer, grid = randomized expected O(n) grid')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes for the divide and conquer (implies the numpy engine)')
+    parser.add_argument('--index', help='load a prebuilt spatial index (.npz) instead of --file', default=None)
+    parser.add_argument('--save-index', help='build a spatial index from --file and save it (.npz)', default=None)
+    parser.add_argument('--follow', action='store_true',
+                        help='tail --file and report the closest pair after each batch of appended points')
+    parser.add_argument('--batch', type=int, default=1000, help='points per batch in --follow mode')
+    parser.add_argument('--poll', type=float, default=1.0, help='seconds between file checks in --follow mode')
+    parser.add_argument('--metric', choices=list(METRICS), default='euclidean',
+                        help='distance metric (haversine expects "lat lon" in degrees and reports km)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='out-of-core mode: stream --file in chunks of this many points')
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='text for people; json, csv or ndjson records for pipelines')
     args = parser.parse_args()
+    if args.format == "csv" and args.steps:
+        parser.error("--steps cannot be written as csv; use --format json or ndjson")
+    if args.metric != "euclidean":
+        # only the python divide and conquer takes other metrics
+        if args.engine != "python" or args.algorithm != "dc" or args.workers > 1:
+            parser.error(f"--metric {args.metric} needs --engine python, --algorithm dc and --workers 1")
+        if args.index or args.follow or args.chunk_size:
+            parser.error(f"--metric {args.metric} is not supported with --index, --follow or --chunk-size")
+    records = None if args.format == "text" else RecordWriter(sys.stdout, args.format, RECORD_FIELDS)
 
     if args.gui:
-        # Enhanced tkinter GUI with steps
+        # Enhanced tkinter GUI with steps; the GUI and plotting modules are only
+        # imported here so --file runs start fast and work on headless machines
+        import tkinter as tk
+        from tkinter import filedialog, messagebox, scrolledtext
+        import matplotlib.pyplot as plt
+
         root = tk.Tk()
         root.title("Closest Pair - Divide & Conquer")
         root.geometry("800x600")
@@ -223,10 +360,13 @@ if __name__ == "__main__":
             scrollbar.config(command=text_area.yview)
             
             # Run algorithm
-            steps = []
+            steps = Trace()
             start = time.perf_counter()
             d, pair = closest_pair(pts, steps)
             elapsed = time.perf_counter() - start
+            # a second, untimed pass counts the operations
+            from backend.profiler import count_closest_pair
+            counts = count_closest_pair(pts)
             
             # Display steps
             text_area.insert(tk.END, f"CLOSEST PAIR - DIVIDE AND CONQUER\n")
@@ -238,6 +378,10 @@ if __name__ == "__main__":
                 text_area.insert(tk.END, step + "\n")
             
             text_area.config(state=tk.DISABLED)
+            info_label.config(text=f"Last run: n = {len(pts)}, {counts['calls']} recursive calls, "
+                                   f"{counts['distance_evals']} distance evaluations\n"
+                                   f"{counts['distance_evals'] / len(pts):.1f} evaluations per point, "
+                                   f"{elapsed:.6f}s")
             
             # Plot
             fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
@@ -269,9 +413,11 @@ if __name__ == "__main__":
             ax2.axis('off')
             ax2.text(0.1, 0.9, 'Divide & Conquer Steps:', fontsize=14, fontweight='bold')
             ax2.text(0.1, 0.8, f'Total Points: {len(pts)}', fontsize=10)
-            ax2.text(0.1, 0.7, f'Recursive Levels: {int(math.log2(len(pts)))}', fontsize=10)
-            ax2.text(0.1, 0.6, f'Time Complexity: O(n log n)', fontsize=10)
-            ax2.text(0.1, 0.5, f'Actual Time: {elapsed:.6f}s', fontsize=10)
+            ax2.text(0.1, 0.72, f'Recursion Depth: {counts["max_depth"]} '
+                                f'({counts["calls"]} calls, {counts["base_cases"]} base cases)', fontsize=10)
+            ax2.text(0.1, 0.64, f'Distance Evaluations: {counts["distance_evals"]}', fontsize=10)
+            ax2.text(0.1, 0.56, f'Strip Points: {counts["strip_points"]}', fontsize=10)
+            ax2.text(0.1, 0.48, f'Actual Time: {elapsed:.6f}s', fontsize=10)
             ax2.text(0.1, 0.4, f'Closest Distance: {d:.6f}', fontsize=10, color='red')
             
             if pair:
@@ -285,33 +431,104 @@ if __name__ == "__main__":
                        command=open_and_run, bg='lightblue', font=('Arial', 12))
         btn.pack(pady=20)
         
-        info_label = tk.Label(root, text="This implementation uses Divide & Conquer algorithm\nTime Complexity: O(n log n)", 
+        # filled with the measured operation counts after each run
+        info_label = tk.Label(root, text="This implementation uses Divide & Conquer algorithm\n"
+                                         "Operation counts are shown after each run", 
                              font=('Arial', 10), fg='darkgreen')
         info_label.pack(pady=10)
         
         root.mainloop()
 
     else:
-        if args.file is None:
-            print("Use --file <path> or --gui")
+        if args.index:
+            from backend.spatial_index import PointIndex
+            start = time.perf_counter()
+            index = PointIndex.load(args.index)
+            d, pair = index.closest_pair()
+            elapsed = time.perf_counter() - start
+            
+            if records:
+                with records:
+                    records.write(result_record(args.index, len(index), d, pair, elapsed))
+            else:
+                print(f"Points: {len(index)}")
+                print("Closest pair:", pair)
+                print(f"Distance: {d:.6f}")
+                print(f"Time: {elapsed:.6f}s (prebuilt index)")
+        elif args.file is None:
+            print("Use --file <path>, --index <path> or --gui")
+        elif args.follow:
+            from backend.dynamic_closest import follow
+            if records:
+                # one record per update, written as soon as it is known
+                records.buffer = 1
+            try:
+                for n, d, pair in follow(args.file, args.batch, args.poll):
+                    if records:
+                        records.write(result_record(args.file, n, d, pair))
+                        sys.stdout.flush()
+                    elif d is None:
+                        print(f"Points: {n}  (need at least 2 points)", flush=True)
+                    else:
+                        print(f"Points: {n}  Distance: {d:.6f}  Closest pair: {pair}", flush=True)
+            except KeyboardInterrupt:
+                pass
+            if records:
+                records.close()
+        elif args.chunk_size:
+            from backend.closest_external import closest_pair_external
+            start = time.perf_counter()
+            d, pair = closest_pair_external(args.file, args.chunk_size)
+            elapsed = time.perf_counter() - start
+            
+            if records:
+                with records:
+                    records.write(result_record(args.file, None, d, pair, elapsed))
+            elif d is None:
+                print("Need at least 2 points.")
+            else:
+                print("Closest pair:", pair)
+                print(f"Distance: {d:.6f}")
+                print(f"Time: {elapsed:.6f}s (out-of-core, chunks of {args.chunk_size} points)")
         else:
-            pts = read_points_from_file(args.file)
+            if args.engine == "numpy" or args.workers > 1:
+                from backend.point_io import load_points
+                pts = load_points(args.file)
+            else:
+                pts = read_points_from_file(args.file)
             if len(pts) < 2:
-                print("Need at least 2 points.")
+                if records:
+                    with records:
+                        records.write(result_record(args.file, len(pts), None, None))
+                else:
+                    print("Need at least 2 points.")
             else:
-                steps = [] if args.steps else None
+                steps = Trace() if args.steps else None
                 start = time.perf_counter()
-                d, pair = closest_pair(pts, steps)
+                d, pair = closest_pair(pts, steps, engine=args.engine, algorithm=args.algorithm,
+                                       workers=args.workers, metric=args.metric)
                 elapsed = time.perf_counter() - start
                 
-                print(f"Points: {len(pts)}")
-                print("Closest pair:", pair)
-                print(f"Distance: {d:.6f}")
-                print(f"Time: {elapsed:.6f}s")
+                if records:
+                    record = result_record(args.file, len(pts), d, pair, elapsed)
+                    if args.steps:
+                        record["steps"] = list(steps)
+                    with records:
+                        records.write(record)
+                else:
+                    print(f"Points: {len(pts)}")
+                    print("Closest pair:", pair)
+                    print(f"Distance: {d:.6f}")
+                    print(f"Time: {elapsed:.6f}s")
                 
-                if args.steps and steps:
+                if args.steps and steps and not records:
                     print("\n" + "="*60)
                     print("STEP-BY-STEP PROCESS:")
                     print("="*60)
                     for step in steps:
-                        print(step)
\ No newline at end of file
+                        print(step)
+                
+                if args.save_index:
+                    from backend.spatial_index import PointIndex
+                    PointIndex(pts).save(args.save_index)
+                    print(f"Saved spatial index to {args.save_index}", file=sys.stderr if records else sys.stdout)
@@ -0,0 +1,121 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backend.closest_numpy import _closest_rec, _strip_check, as_point_array, closest_pair_numpy_indices
+
+
+def _to_shared(arr):
+    """Copy arr into a new shared memory block"""
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    del view
+    return shm
+
+
+def _attach(name, shape, dtype):
+    # pool workers share the parent's resource tracker, and the parent unlinks
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _solve_slab(spec, lo, hi):
+    """Worker: solve x-order positions [lo, hi) on the shared arrays"""
+    n, pts_name, px_name, rank_name = spec
+    blocks = []
+    try:
+        shm, pts = _attach(pts_name, (n, 2), np.float64)
+        blocks.append(shm)
+        shm, px = _attach(px_name, (n,), np.intp)
+        blocks.append(shm)
+        shm, rank = _attach(rank_name, (n,), np.intp)
+        blocks.append(shm)
+
+        x = pts[:, 0]
+        y = pts[:, 1]
+        sub = px[lo:hi]
+        py = sub[np.lexsort((x[sub], y[sub]))]
+        d2, a, b = _closest_rec(x, y, px, rank, lo, hi, py)
+        # drop the views before closing the blocks they point into
+        del x, y, sub, py, pts, px, rank
+        return d2, a, b
+    finally:
+        for shm in blocks:
+            shm.close()
+
+
+def _merge(x, y, xs, px, lo, mid, hi, left, right):
+    """Combine two adjacent slab results with a strip pass around x[px[mid]]"""
+    best = left if left[0] < right[0] else right
+    if best[0] == 0.0:
+        return best
+    midx = xs[mid]
+    d = math.sqrt(best[0])
+    # px is sorted by x, so the strip is one contiguous run of x-order positions
+    s = lo + int(np.searchsorted(xs[lo:hi], midx - d, side="right"))
+    e = lo + int(np.searchsorted(xs[lo:hi], midx + d, side="left"))
+    strip = px[s:e]
+    if len(strip) < 2:
+        return best
+    strip = strip[np.lexsort((x[strip], y[strip]))]
+    return _strip_check(x, y, strip, best)
+
+
+def closest_pair_parallel_indices(points, workers=2, levels=None):
+    """Closest pair with the top recursion levels solved in a process pool.
+
+    The x order is cut into 2**levels slabs (levels defaults to enough for
+    one slab per worker). Each worker attaches to the points, x order and
+    rank arrays through multiprocessing.shared_memory, so no point data is
+    pickled, and solves its slab with the NumPy engine. The parent then
+    merges neighbouring slabs bottom-up with strip passes.
+
+    Returns (min_dist, i, j) like closest_pair_numpy_indices.
+    """
+    pts = as_point_array(points)
+    n = len(pts)
+    if levels is None:
+        levels = max(1, (workers - 1).bit_length())
+    slabs = 1 << levels
+    if workers <= 1 or n < 4 * slabs:
+        return closest_pair_numpy_indices(pts)
+
+    x = pts[:, 0]
+    y = pts[:, 1]
+    px = np.lexsort((y, x))
+    rank = np.empty(n, dtype=np.intp)
+    rank[px] = np.arange(n)
+    xs = x[px]
+
+    blocks = []
+    try:
+        for arr in (pts, px.astype(np.intp, copy=False), rank):
+            blocks.append(_to_shared(arr))
+        spec = (n, blocks[0].name, blocks[1].name, blocks[2].name)
+
+        bounds = [n * k // slabs for k in range(slabs + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_solve_slab, spec, bounds[k], bounds[k + 1])
+                       for k in range(slabs)]
+            results = [f.result() for f in futures]
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    # merge pairs of neighbouring slabs until one result is left
+    while len(results) > 1:
+        merged = []
+        merged_bounds = [bounds[0]]
+        for k in range(0, len(results), 2):
+            lo, mid, hi = bounds[k], bounds[k + 1], bounds[k + 2]
+            merged.append(_merge(x, y, xs, px, lo, mid, hi, results[k], results[k + 1]))
+            merged_bounds.append(hi)
+        results = merged
+        bounds = merged_bounds
+
+    d2, a, b = results[0]
+    return float(np.sqrt(d2)), a, b
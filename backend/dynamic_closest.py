@@ -0,0 +1,178 @@
+import heapq
+import math
+import time
+
+from backend.closest_grid import closest_pair_grid, pairs_within_grid
+
+# Rebuild the grid once the closest distance is this many times below the cell size
+SHRINK_FACTOR = 8
+
+
+class DynamicClosestPair:
+    """Closest pair of a point set under insert(p) and delete(p).
+
+    Copies of one coordinate are kept in a multiset (ids): while any
+    coordinate has two or more live copies the answer is 0, and adding or
+    removing a copy is O(1). The distinct coordinates live in a hash grid
+    with cells of side `cell`, and every pair of them closer than `cell`
+    sits in a min-heap, so the answer is otherwise the first heap entry
+    whose coordinates are both still present (removed ones are skipped
+    lazily). When no such pair is left the closest distance is at least
+    `cell` and the grid is rebuilt around a fresh closest_pair result; when
+    inserts shrink the answer far below `cell` the grid is rebuilt finer.
+    Both rebuilds are O(n) and rare, so updates are amortized O(log n).
+    """
+
+    def __init__(self, points=(), min_dist=None):
+        # min_dist may be passed in from an existing closest_pair() result
+        # points by id; ids are never reused
+        self.points = {}
+        # coordinate -> ids of its live copies, and the coordinates with two or more
+        self.ids = {}
+        self.repeated = set()
+        self.next_id = 0
+        for p in points:
+            self._add(tuple(p))
+        self.heap = []
+        self.grid = {}
+        self.cell = 0.0
+        # heap size right after the last rebuild, the base of the compaction check
+        self.built = 0
+        self._rebuild(min_dist or None)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _add(self, p):
+        """Record a copy of p; returns its id and whether p is a new coordinate"""
+        i = self.next_id
+        self.next_id += 1
+        self.points[i] = p
+        same = self.ids.setdefault(p, [])
+        same.append(i)
+        if len(same) == 2:
+            self.repeated.add(p)
+        return i, len(same) == 1
+
+    def _key(self, p):
+        return (int(p[0] // self.cell), int(p[1] // self.cell))
+
+    def _rebuild(self, min_dist=None):
+        """Re-grid the distinct coordinates around their closest distance"""
+        pts = list(self.ids)
+        self.heap = []
+        self.grid = {}
+        self.built = 0
+        if len(pts) < 2:
+            self.cell = 0.0
+            return
+        if min_dist is None:
+            min_dist, _ = closest_pair_grid(pts)
+        self.cell = 2 * min_dist
+        for p in pts:
+            self.grid.setdefault(self._key(p), []).append(p)
+        for d, a, b in pairs_within_grid(pts, self.cell):
+            self.heap.append((d, pts[a], pts[b]))
+        heapq.heapify(self.heap)
+        self.built = len(self.heap)
+
+    def _prune(self):
+        """Pop heap entries whose coordinates were removed, so heap[0] is the live minimum"""
+        while self.heap and (self.heap[0][1] not in self.ids or self.heap[0][2] not in self.ids):
+            heapq.heappop(self.heap)
+
+    def insert(self, p):
+        """Add point p; returns its id"""
+        p = tuple(p)
+        i, new = self._add(p)
+        if not new:
+            # another copy: the answer is 0 until copies are deleted, no grid work
+            return i
+        if self.cell == 0:
+            self._rebuild()
+            return i
+        cx, cy = self._key(p)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for q in self.grid.get((cx + dx, cy + dy), ()):
+                    d = math.hypot(p[0] - q[0], p[1] - q[1])
+                    if d <= self.cell:
+                        heapq.heappush(self.heap, (d, q, p))
+        self.grid.setdefault((cx, cy), []).append(p)
+        self._prune()
+        if self.heap and self.heap[0][0] * SHRINK_FACTOR < self.cell:
+            self._rebuild(self.heap[0][0])
+        return i
+
+    def delete(self, p):
+        """Remove one copy of point p; returns False if p is not present"""
+        p = tuple(p)
+        same = self.ids.get(p)
+        if not same:
+            return False
+        del self.points[same.pop()]
+        if len(same) == 1:
+            self.repeated.discard(p)
+        if same:
+            return True
+        # last copy: the coordinate leaves the grid, its heap entries die lazily
+        del self.ids[p]
+        if self.cell:
+            self.grid[self._key(p)].remove(p)
+        # compact once the heap has outgrown its size at the last rebuild
+        if len(self.heap) > 2 * self.built + 4 * len(self.ids) + 64:
+            self._rebuild()
+        return True
+
+    def current_closest(self):
+        """Closest pair of the live points as (min_dist, pair), like closest_pair()"""
+        if self.repeated:
+            p = next(iter(self.repeated))
+            return 0.0, (p, p)
+        while True:
+            self._prune()
+            if self.heap:
+                d, p, q = self.heap[0]
+                return d, (p, q)
+            if len(self.ids) < 2:
+                return None, None
+            # every pair is at least `cell` apart now: re-grid coarser
+            self._rebuild()
+
+
+def follow(path, batch=1000, poll=1.0):
+    """Tail a point file, yielding (n, min_dist, pair) after each batch of new points.
+
+    Lines with two numbers are points; a count header or other lines are
+    skipped. After the current end of the file is reached the file is polled
+    every `poll` seconds for appended lines (stop with KeyboardInterrupt).
+    """
+    dyn = None
+    pending = []
+    with open(path, "rb") as f:
+        while True:
+            line = f.readline()
+            if line and not line.endswith(b"\n"):
+                # partial line still being written: wait for the rest
+                f.seek(-len(line), 1)
+                line = b""
+            if line:
+                parts = line.split()
+                if len(parts) == 2:
+                    try:
+                        pending.append((float(parts[0]), float(parts[1])))
+                    except ValueError:
+                        pass
+                if len(pending) < batch:
+                    continue
+            if pending:
+                if dyn is None:
+                    dyn = DynamicClosestPair(pending)
+                else:
+                    for p in pending:
+                        dyn.insert(p)
+                pending = []
+                d, pair = dyn.current_closest()
+                yield len(dyn), d, pair
+                continue
+            time.sleep(poll)
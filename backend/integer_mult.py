@@ -1,68 +1,78 @@
+import itertools
+import os
+import sys
 import time
-import tkinter as tk
-import numpy as np
-from tkinter import filedialog, messagebox
-import matplotlib.pyplot as plt
 
-def read_numbers_from_file(path):
-    nums = []
+if __package__ in (None, ""):
+    # running as `python backend/integer_mult.py`: make the backend package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.multiply import METHODS, multiply
+from backend.records import FORMATS, RecordWriter
+from backend.mult_steps import CACHE_POLICIES, STEP_METHODS, ProductCache, multiply_with_steps
+
+# "steps" records every recursive call for display, "fast" runs multiply() without steps,
+# "batch" multiplies all pairs at once (vectorized for small operands, see mult_batch)
+ENGINES = ("steps", "fast", "batch")
+
+# Pairs read, multiplied and written at a time by stream_products
+STREAM_CHUNK = 1 << 16
+
+# Columns of --format csv
+RECORD_FIELDS = ["a", "b", "product"]
+
+def warn(message):
+    """Report a problem on stderr, keeping stdout for results"""
+    print(message, file=sys.stderr)
+
+def iter_numbers(path, log=warn):
+    """Generate the integers of a file one line at a time; bad lines are reported through log"""
     with open(path) as f:
         for i, line in enumerate(f, start=1):
             line = line.strip()
             if line:
                 try:
-                    num = int(line)
-                    nums.append(num)
+                    yield int(line)
                 except ValueError:
-                    print(f"Skipping non-integer line {i}: {line}")
-    return nums
-
-def karatsuba_multiply(x, y):
-    """divide-and-conquer multiplication algorithm"""
-    # Base case: if numbers are small enough, use regular multiplication
-    if x < 10 or y < 10:
-        return x * y, [(x, y, x * y, "Base case")]
-    
-    # Calculate the size of the numbers
-    n = max(len(str(x)), len(str(y)))
-    m = n // 2
-    
-    # Split the digit sequences in the middle
-    high1, low1 = x // (10**m), x % (10**m)
-    high2, low2 = y // (10**m), y % (10**m)
-    
-    # Recursive steps
-    z0, steps0 = karatsuba_multiply(low1, low2)
-    z1, steps1 = karatsuba_multiply((low1 + high1), (low2 + high2))
-    z2, steps2 = karatsuba_multiply(high1, high2)
-    
-    # Combine the results
-    result = z2 * (10**(2*m)) + (z1 - z2 - z0) * (10**m) + z0
-    
-    # Collect all steps for visualization
-    all_steps = steps0 + steps1 + steps2
-    all_steps.append((x, y, result, f"Combine: z2*10^{2*m} + (z1-z2-z0)*10^{m} + z0"))
-    
-    return result, all_steps
+                    log(f"Skipping non-integer line {i}: {line}")
 
-def multiply_with_steps(a, b):
-    """Return final product and list of partial products using divide-and-conquer"""
-    final, all_steps = karatsuba_multiply(a, b)
-    
-    # Filter to show only the main recursive calls (not base cases unless they're interesting)
-    partials_info = []
-    for step in all_steps:
-        x, y, product, description = step
-        # Only include steps where at least one number has more than 1 digit
-        if description != "Base case" or (x >= 10 or y >= 10):
-            partials_info.append({
-                'x': x,
-                'y': y, 
-                'product': product,
-                'description': description
-            })
-    
-    return final, partials_info
+def read_numbers_from_file(path):
+    return list(iter_numbers(path))
+
+def stream_products(file1, file2, out, method="auto", workers=1, chunk=STREAM_CHUNK, fmt="text"):
+    """Write the pairwise products of two files to out without loading either file.
+
+    The files are zipped `chunk` numbers at a time and each chunk goes through
+    multiply_batch, so memory stays constant whatever the file length. fmt
+    "text" writes one product per line, json/csv/ndjson write {a, b, product}
+    records. Warnings go to stderr to keep out clean. Returns (pairs written, elapsed).
+    """
+    if chunk < 1:
+        raise ValueError("chunk must be at least 1")
+    from backend.mult_batch import multiply_batch
+    records = None if fmt == "text" else RecordWriter(out, fmt, RECORD_FIELDS, buffer=chunk)
+    nums1 = iter_numbers(file1, warn)
+    nums2 = iter_numbers(file2, warn)
+
+    count = 0
+    start = time.perf_counter()
+    while True:
+        part1 = list(itertools.islice(nums1, chunk))
+        part2 = list(itertools.islice(nums2, chunk))
+        products = multiply_batch(part1, part2, method, workers)
+        if records:
+            records.write_all({"a": a, "b": b, "product": p} for a, b, p in zip(part1, part2, products))
+        elif products:
+            out.write("\n".join(map(str, products)) + "\n")
+        count += len(products)
+        if len(part1) != len(part2) or len(part1) < chunk:
+            break
+    # a longer file still has numbers left when the shorter one ran out
+    if len(part1) != len(part2) or next(nums1, None) is not None or next(nums2, None) is not None:
+        warn("Warning: Files have different lengths. Multiplying up to the shortest file.")
+    if records:
+        records.close()
+    return count, time.perf_counter() - start
 
 def format_steps(a, b, final, partials):
     """Return string showing step-by-step multiplication using divide-and-conquer"""
@@ -84,6 +94,10 @@ def format_steps(a, b, final, partials):
     return "\n".join(lines)
 
 def show_results_gui(results, elapsed):
+    import tkinter as tk
+    import numpy as np
+    import matplotlib.pyplot as plt
+
     win = tk.Toplevel()
     win.title("Multiplication Steps - Divide & Conquer")
     win.geometry("700x600")
@@ -135,18 +149,40 @@ def show_results_gui(results, elapsed):
     plt.tight_layout(pad=2.0)
     plt.show()
 
-def multiply_files(file1, file2):
+def multiply_files(file1, file2, engine="steps", method=None, workers=None, cache=None):
+    """Multiply the numbers of two files pairwise; the fast and batch engines record no steps.
+
+    method defaults to "karatsuba" for the step engine and "auto" otherwise.
+    workers is the process count for big operands on the batch engine.
+    cache is a ProductCache shared by all pairs (step engine, karatsuba only).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    if method is None:
+        method = "karatsuba" if engine == "steps" else "auto"
+    if engine == "steps" and method not in STEP_METHODS:
+        raise ValueError(f"Method {method!r} records no steps, use the fast engine")
+    if cache is not None and engine != "steps":
+        raise ValueError("A product cache is only used by the steps engine")
     nums1 = read_numbers_from_file(file1)
     nums2 = read_numbers_from_file(file2)
 
     if len(nums1) != len(nums2):
-        print("Warning: Files have different lengths. Multiplying up to the shortest file.")
+        warn("Warning: Files have different lengths. Multiplying up to the shortest file.")
 
     results = []
     start = time.perf_counter()
-    for a, b in zip(nums1, nums2):
-        final, partials = multiply_with_steps(a, b)
-        results.append((a, b, final, partials))
+    if engine == "batch":
+        from backend.mult_batch import multiply_batch
+        products = multiply_batch(nums1, nums2, method, workers)
+        results = [(a, b, p, []) for a, b, p in zip(nums1, nums2, products)]
+    else:
+        for a, b in zip(nums1, nums2):
+            if engine == "fast":
+                results.append((a, b, multiply(a, b, method), []))
+            else:
+                final, partials = multiply_with_steps(a, b, method, cache)
+                results.append((a, b, final, partials))
     elapsed = time.perf_counter() - start
     return results, elapsed
 
@@ -157,9 +193,46 @@ if __name__ == "__main__":
     parser.add_argument('--file1', help='first input file path', default=None)
     parser.add_argument('--file2', help='second input file path', default=None)
     parser.add_argument('--gui', action='store_true', help='open GUI')
+    parser.add_argument('--engine', choices=ENGINES, default=None,
+                        help='steps = show the recursion, fast = multiply() without steps, '
+                             'batch = all pairs at once, vectorized where they fit in 64 bits '
+                             '(default: steps with --steps, otherwise fast)')
+    parser.add_argument('--steps', action='store_true', help='show the step-by-step recursion of every pair')
+    parser.add_argument('--method', choices=METHODS, default=None,
+                        help=f'multiplication algorithm (steps engine: {", ".join(STEP_METHODS)}; '
+                             'default karatsuba, or auto on the other engines)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='batch engine: processes for big operands (default: one per CPU)')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='memoize up to this many Karatsuba sub-products across all pairs (0 = off)')
+    parser.add_argument('--cache-policy', choices=CACHE_POLICIES, default='lru',
+                        help='which cached sub-product to evict when the cache is full')
+    parser.add_argument('--no-steps', action='store_true',
+                        help='stream products only, one per line, in constant memory (for huge files)')
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='text for people; json, csv or ndjson records of a, b, product for pipelines')
+    parser.add_argument('--output', default=None, help='write results here instead of stdout')
     args = parser.parse_args()
+    if args.engine is None:
+        args.engine = "steps" if args.steps else "fast"
+    if args.steps and (args.engine != "steps" or args.no_steps):
+        parser.error("--steps needs the steps engine and cannot be streamed with --no-steps")
+    if args.engine == "steps" and args.method not in (None,) + STEP_METHODS and not args.no_steps:
+        parser.error(f"--method {args.method} records no steps; add --engine fast")
+    if args.format == "csv" and args.engine == "steps" and not args.no_steps:
+        parser.error("steps cannot be written as csv; use --format json or ndjson")
+    if args.cache_size and (args.engine != "steps" or args.no_steps or args.method not in (None, "karatsuba")):
+        parser.error("--cache-size applies to the steps engine with the karatsuba method")
+    cache = ProductCache(args.cache_size, args.cache_policy) if args.cache_size > 0 else None
+    if hasattr(sys, "set_int_max_str_digits"):
+        # products of big operands exceed the default limit on int <-> str conversion
+        sys.set_int_max_str_digits(0)
 
     if args.gui:
+        # tkinter is only imported for the GUI so file runs work on headless machines
+        import tkinter as tk
+        from tkinter import filedialog, messagebox
+
         root = tk.Tk()
         root.title("Integer Multiplication - Divide & Conquer")
         root.geometry("450x120")
@@ -186,10 +259,38 @@ if __name__ == "__main__":
         if not args.file1 or not args.file2:
             print("Use --file1 <path> --file2 <path> or --gui")
         else:
-            results, elapsed = multiply_files(args.file1, args.file2)
-            if not results:
-                print("No valid numbers to multiply")
+            out = open(args.output, "w") if args.output else sys.stdout
+            # the summary goes to stderr whenever stdout may carry records
+            info_out = sys.stdout if args.format == "text" and not args.no_steps else sys.stderr
+            try:
+                if args.no_steps:
+                    count, elapsed = stream_products(args.file1, args.file2, out, args.method or "auto",
+                                                     args.workers or 1, fmt=args.format)
+                else:
+                    results, elapsed = multiply_files(args.file1, args.file2, args.engine, args.method,
+                                                      args.workers, cache)
+                    count = len(results)
+                    if args.format != "text":
+                        with RecordWriter(out, args.format, RECORD_FIELDS) as records:
+                            for a, b, final, partials in results:
+                                record = {"a": a, "b": b, "product": final}
+                                if args.engine == "steps":
+                                    record["steps"] = partials
+                                records.write(record)
+                    elif args.engine == "steps":
+                        out.write("".join(format_steps(a, b, final, partials) + "\n"
+                                          for a, b, final, partials in results))
+                    else:
+                        out.write("".join(f"{a} × {b} = {final}\n" for a, b, final, _ in results))
+            finally:
+                if args.output:
+                    out.close()
+            if not count:
+                print("No valid numbers to multiply", file=info_out)
             else:
-                for a, b, final, partials in results:
-                    print(format_steps(a, b, final, partials))
-                print(f"\nTotal time: {elapsed:.6f}s")
\ No newline at end of file
+                print(f"\nTotal time: {elapsed:.6f}s", file=info_out)
+                print(f"Throughput: {count / max(elapsed, 1e-9):,.0f} multiplications/s", file=info_out)
+                if cache is not None:
+                    info = cache.info()
+                    print(f"Cache: {info['hits']} hits, {info['misses']} misses, {info['evictions']} evictions "
+                          f"({info['size']}/{info['maxsize']} entries, {info['policy']})", file=info_out)
\ No newline at end of file
@@ -0,0 +1,96 @@
+import math
+
+# Mean earth radius in km; haversine distances are reported in km
+EARTH_RADIUS_KM = 6371.0088
+
+# Relative slack on the haversine pruning bounds so rounding never cuts a real candidate
+_SLACK = 1 + 1e-9
+
+
+class Metric:
+    """A distance function plus the pruning rules the divide and conquer needs.
+
+    dist(p, q) is the distance. Two points closer than d differ by less than
+    x_reach(d) along x, and inside the strip around the split line x = midx
+    by less than y_reach(d, midx) along y. period is the wrap-around length
+    of the y axis (360 for longitudes) or None.
+    """
+
+    def __init__(self, name, dist, x_reach, y_reach=None, period=None):
+        self.name = name
+        self.dist = dist
+        self.x_reach = x_reach
+        self.y_reach = y_reach or (lambda d, midx: x_reach(d))
+        self.period = period
+
+    def __repr__(self):
+        return f"Metric({self.name!r})"
+
+
+def euclidean(p, q):
+    return math.hypot(p[0] - q[0], p[1] - q[1])
+
+
+def sqeuclidean(p, q):
+    # squared distance: same closest pair as euclidean without a sqrt per pair
+    dx = p[0] - q[0]
+    dy = p[1] - q[1]
+    return dx * dx + dy * dy
+
+
+def manhattan(p, q):
+    return abs(p[0] - q[0]) + abs(p[1] - q[1])
+
+
+def chebyshev(p, q):
+    return max(abs(p[0] - q[0]), abs(p[1] - q[1]))
+
+
+def haversine(p, q):
+    """Great-circle distance in km between (latitude, longitude) points in degrees"""
+    lat1 = math.radians(p[0])
+    lat2 = math.radians(q[0])
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(q[1] - p[1]) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _same(d):
+    return d
+
+
+def _haversine_lat_reach(d):
+    # the central angle is at least the latitude difference
+    return math.degrees(d / EARTH_RADIUS_KM) * _SLACK
+
+
+def _haversine_lon_reach(d, midx):
+    # hav(angle) >= cos(lat1) cos(lat2) hav(dlon), and every latitude in the
+    # strip is at most |midx| + lat reach away from the equator
+    theta = d / EARTH_RADIUS_KM
+    lat = abs(midx) + math.degrees(theta)
+    if lat >= 90:
+        return 360.0
+    s = math.sin(theta / 2) / math.cos(math.radians(lat))
+    if s >= 1:
+        return 360.0
+    return math.degrees(2 * math.asin(s)) * _SLACK
+
+
+METRICS = {
+    "euclidean": Metric("euclidean", euclidean, _same),
+    "sqeuclidean": Metric("sqeuclidean", sqeuclidean, math.sqrt),
+    "manhattan": Metric("manhattan", manhattan, _same),
+    "chebyshev": Metric("chebyshev", chebyshev, _same),
+    "haversine": Metric("haversine", haversine, _haversine_lat_reach, _haversine_lon_reach, period=360.0),
+}
+
+
+def get_metric(metric):
+    """Look up a metric by name (a Metric is returned unchanged)"""
+    if isinstance(metric, Metric):
+        return metric
+    try:
+        return METRICS[metric]
+    except KeyError:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {tuple(METRICS)}") from None
@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend.multiply import METHODS, multiply
+
+# Pairs are routed by operand size:
+#   both in [0, 2^32)          -> one uint64 NumPy multiply (product < 2^64)
+#   both in (-2^31, 2^31)      -> one int64 NumPy multiply (|product| < 2^62)
+#   smaller operand < POOL_BITS -> object arrays, CHUNK pairs per NumPy call
+#   otherwise                  -> multiply(a, b, method) on a process pool
+UINT_LIMIT = 1 << 32
+INT_LIMIT = 1 << 31
+POOL_BITS = 1 << 16
+CHUNK = 1 << 14
+
+
+def split_by_size(nums1, nums2):
+    """Indices of the pairs for each path: (uint64, int64, object, pool)"""
+    unsigned, signed, chunked, pooled = [], [], [], []
+    for i, (a, b) in enumerate(zip(nums1, nums2)):
+        if 0 <= a < UINT_LIMIT and 0 <= b < UINT_LIMIT:
+            unsigned.append(i)
+        elif -INT_LIMIT < a < INT_LIMIT and -INT_LIMIT < b < INT_LIMIT:
+            signed.append(i)
+        elif min(abs(a).bit_length(), abs(b).bit_length()) < POOL_BITS:
+            chunked.append(i)
+        else:
+            pooled.append(i)
+    return unsigned, signed, chunked, pooled
+
+
+def _vector_products(nums1, nums2, idx, dtype):
+    a = np.fromiter((nums1[i] for i in idx), dtype=dtype, count=len(idx))
+    b = np.fromiter((nums2[i] for i in idx), dtype=dtype, count=len(idx))
+    return (a * b).tolist()
+
+
+def _object_products(nums1, nums2, idx, chunk):
+    out = []
+    for s in range(0, len(idx), chunk):
+        part = idx[s:s + chunk]
+        a = np.fromiter((nums1[i] for i in part), dtype=object, count=len(part))
+        b = np.fromiter((nums2[i] for i in part), dtype=object, count=len(part))
+        out.extend(a * b)
+    return out
+
+
+def _all_unsigned(nums1, nums2):
+    """Products of the whole lists if every operand is in [0, UINT_LIMIT), else None"""
+    try:
+        a = np.fromiter(nums1, dtype=np.uint64, count=len(nums1))
+        b = np.fromiter(nums2, dtype=np.uint64, count=len(nums2))
+    except OverflowError:
+        return None
+    if len(a) and (a.max() >= UINT_LIMIT or b.max() >= UINT_LIMIT):
+        return None
+    return (a * b).tolist()
+
+
+def multiply_batch(nums1, nums2, method="auto", workers=None, chunk=CHUNK):
+    """Products of nums1[i] * nums2[i] for the common length of both lists.
+
+    Small operands are multiplied in one vectorized uint64/int64 call and
+    medium ones as object arrays, chunk pairs at a time. Pairs whose smaller
+    operand has POOL_BITS bits or more go through multiply(a, b, method) on
+    a pool of `workers` processes (None = one per CPU, 1 = this process).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+    if chunk < 1:
+        raise ValueError("chunk must be at least 1")
+    n = min(len(nums1), len(nums2))
+    nums1, nums2 = nums1[:n], nums2[:n]
+    # the common case (all operands small and non-negative) skips the per-pair routing
+    products = _all_unsigned(nums1, nums2)
+    if products is not None:
+        return products
+
+    products = [0] * n
+    unsigned, signed, chunked, pooled = split_by_size(nums1, nums2)
+
+    for idx, values in (
+        (unsigned, _vector_products(nums1, nums2, unsigned, np.uint64)),
+        (signed, _vector_products(nums1, nums2, signed, np.int64)),
+        (chunked, _object_products(nums1, nums2, chunked, chunk)),
+    ):
+        for i, v in zip(idx, values):
+            products[i] = v
+
+    big1 = [nums1[i] for i in pooled]
+    big2 = [nums2[i] for i in pooled]
+    if workers == 1 or len(pooled) <= 1:
+        values = [multiply(a, b, method) for a, b in zip(big1, big2)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            values = list(pool.map(multiply, big1, big2, [method] * len(pooled)))
+    for i, v in zip(pooled, values):
+        products[i] = v
+    return products
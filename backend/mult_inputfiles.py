@@ -1,14 +1,59 @@
-import random
+import argparse
 import os
+import random
+
+import numpy as np
+
+# Value layouts generate_numbers can draw
+DISTRIBUTIONS = ("uniform", "duplicates")
+
+
+def generate_numbers(n, dist="uniform", seed=None, max_value=1000000, digits=None):
+    """List of n non-negative ints.
+
+    With digits set every number has exactly that many digits, otherwise they
+    lie in [0, max_value]. dist "duplicates" draws them from a pool of
+    n // 100 values, so most numbers repeat.
+    """
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {dist!r}, expected one of {DISTRIBUTIONS}")
+    count = max(1, n // 100) if dist == "duplicates" else n
+    if digits is None and max_value < 2**62:
+        rng = np.random.default_rng(seed)
+        values = rng.integers(0, max_value + 1, count).tolist()
+    else:
+        rng = random.Random(seed)
+        lo, hi = (10 ** (digits - 1), 10 ** digits - 1) if digits else (0, max_value)
+        values = [rng.randint(lo, hi) for _ in range(count)]
+    if dist == "duplicates":
+        pick = np.random.default_rng(seed).integers(0, count, n)
+        values = [values[i] for i in pick.tolist()]
+    return values
+
+
+def write_numbers_file(path, numbers):
+    """Write numbers in the input format: the count, then one number per line"""
+    with open(path, "w") as f:
+        f.write(f"{len(numbers)}\n")
+        f.write("".join(f"{x}\n" for x in numbers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate integer multiplication input files")
+    parser.add_argument('--files', type=int, default=10, help='number of files to write')
+    parser.add_argument('--min-n', type=int, default=100, help='fewest numbers per file')
+    parser.add_argument('--max-n', type=int, default=300, help='most numbers per file')
+    parser.add_argument('--dist', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--max-value', type=int, default=1000000)
+    parser.add_argument('--digits', type=int, default=None, help='exact digit count of every number')
+    parser.add_argument('--seed', type=int, default=None, help='seed for reproducible files')
+    parser.add_argument('--out-dir', default='mult_inputs')
+    args = parser.parse_args()
 
-os.makedirs("mult_inputs", exist_ok=True)
-
-for i in range(1, 11):
-    filename = f"mult_inputs/mult_input_{i}.txt"
-    with open(filename, "w") as f:
-        n = random.randint(100, 300)   # at least 100 points
-        f.write(str(n) + "\n")
-        for _ in range(n):
-            x = random.randint(0, 1000000)
-            f.write(f"{x}\n")
-    print(f"Created {filename} with {n} points.")
+    os.makedirs(args.out_dir, exist_ok=True)
+    rng = random.Random(args.seed)
+    for i in range(1, args.files + 1):
+        filename = os.path.join(args.out_dir, f"mult_input_{i}.txt")
+        n = rng.randint(args.min_n, args.max_n)
+        write_numbers_file(filename, generate_numbers(n, args.dist, rng.getrandbits(64), args.max_value, args.digits))
+        print(f"Created {filename} with {n} numbers.")
@@ -0,0 +1,46 @@
+import functools
+
+# Products whose smaller operand has at most this many bits go straight to
+# int * int; tuned with benchmarks/bench_mult_karatsuba.py --tune
+KARATSUBA_CUTOFF = 65536
+
+# Split points are rounded to whole 64-bit limbs
+LIMB_BITS = 64
+
+
+# one entry per operand size met in a recursion; bounded for long runs over many sizes
+@functools.lru_cache(maxsize=256)
+def _split(bits):
+    """Split point m (in bits, limb aligned) and low-half mask for a bits-long operand"""
+    m = ((bits + 1) // 2 + LIMB_BITS - 1) // LIMB_BITS * LIMB_BITS
+    return m, (1 << m) - 1
+
+
+def _karatsuba(x, y, cutoff):
+    # x, y >= 0
+    xb = x.bit_length()
+    yb = y.bit_length()
+    if xb <= cutoff or yb <= cutoff:
+        return x * y
+    m, mask = _split(max(xb, yb))
+    x1, x0 = x >> m, x & mask
+    y1, y0 = y >> m, y & mask
+    z2 = _karatsuba(x1, y1, cutoff)
+    z0 = _karatsuba(x0, y0, cutoff)
+    z1 = _karatsuba(x0 + x1, y0 + y1, cutoff) - z2 - z0
+    return (z2 << (2 * m)) + (z1 << m) + z0
+
+
+def karatsuba_fast(x, y, cutoff=KARATSUBA_CUTOFF):
+    """Karatsuba product of two ints, without step recording.
+
+    Operands are split on bit boundaries with shifts and masks (no decimal
+    strings or powers of ten), split points and masks are cached per
+    operand size, and below `cutoff` bits the product is left to int * int.
+    Returns exactly x * y.
+    """
+    # below one limb the limb-aligned split would not shrink the operands
+    cutoff = max(cutoff, LIMB_BITS)
+    if (x < 0) != (y < 0):
+        return -_karatsuba(abs(x), abs(y), cutoff)
+    return _karatsuba(abs(x), abs(y), cutoff)
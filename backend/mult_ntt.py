@@ -0,0 +1,139 @@
+import functools
+
+import numpy as np
+
+# NTT primes p = c * 2^k + 1 and a primitive root of each; both support
+# transforms up to 2^26 points and their product (~2^59.7) bounds every
+# convolution coefficient of 16-bit limbs at that length
+PRIMES = (2013265921, 469762049)  # 15 * 2^27 + 1, 7 * 2^26 + 1
+ROOTS = (31, 3)
+MAX_LOG = 26
+
+# Operands are cut into little-endian limbs of this many bits
+LIMB_BITS = 16
+
+_MOD = np.array(PRIMES, dtype=np.int64)
+# p0^-1 mod p1 for the CRT step
+_P0_INV = pow(PRIMES[0], -1, PRIMES[1])
+
+
+# a table holds n values per prime, so only the last few transform sizes are kept
+@functools.lru_cache(maxsize=8)
+def _twiddles(n, inverse):
+    """(primes, n // 2) array of the powers of each prime's n-th root of unity"""
+    half = n // 2
+    out = np.empty((len(PRIMES), half), dtype=np.int64)
+    for k, (p, g) in enumerate(zip(PRIMES, ROOTS)):
+        w = pow(g, (p - 1) // n, p)
+        if inverse:
+            w = pow(w, p - 2, p)
+        row = np.ones(1, dtype=np.int64)
+        while len(row) < half:
+            # doubling: the next len(row) powers are the current ones times w^len(row)
+            row = np.concatenate((row, row * pow(w, len(row), p) % p))
+        out[k] = row[:half]
+    return out
+
+
+def _forward(a):
+    """In-place decimation-in-frequency NTT over the last axis of a (primes, m, n) array.
+
+    Output is in bit-reversed order, which the inverse transform expects.
+    """
+    n = a.shape[-1]
+    tw = _twiddles(n, False)
+    mod = _MOD[:, None, None, None]
+    h = n // 2
+    while h >= 1:
+        blocks = a.reshape(a.shape[0], a.shape[1], -1, 2, h)
+        u = blocks[:, :, :, 0, :]
+        v = blocks[:, :, :, 1, :]
+        s = u + v
+        d = u - v
+        np.remainder(s, mod, out=u)
+        np.remainder(d * tw[:, None, None, ::(n // 2) // h], mod, out=v)
+        h //= 2
+
+
+def _inverse(a):
+    """In-place decimation-in-time inverse NTT of a (primes, n) array in bit-reversed order"""
+    n = a.shape[-1]
+    tw = _twiddles(n, True)
+    mod = _MOD[:, None, None]
+    h = 1
+    while h < n:
+        blocks = a.reshape(a.shape[0], -1, 2, h)
+        u = blocks[:, :, 0, :]
+        v = blocks[:, :, 1, :]
+        t = v * tw[:, None, ::(n // 2) // h] % mod
+        s = u + t
+        d = u - t
+        np.remainder(s, mod, out=u)
+        np.remainder(d, mod, out=v)
+        h *= 2
+    n_inv = np.array([pow(n, p - 2, p) for p in PRIMES], dtype=np.int64)
+    a *= n_inv[:, None]
+    a %= _MOD[:, None]
+
+
+def _to_limbs(x):
+    nbytes = (x.bit_length() + LIMB_BITS - 1) // LIMB_BITS * (LIMB_BITS // 8)
+    return np.frombuffer(x.to_bytes(nbytes, "little"), dtype="<u2")
+
+
+def _from_coefficients(c):
+    """sum(c[i] << (16 * i)) for non-negative int64 coefficients below 2^64"""
+    result = 0
+    for j in range(4):
+        piece = ((c >> (16 * j)) & 0xFFFF).astype("<u2")
+        result += int.from_bytes(piece.tobytes(), "little") << (16 * j)
+    return result
+
+
+def _ntt_mul(x, y):
+    # x, y > 0
+    lx = _to_limbs(x)
+    ly = _to_limbs(y)
+    size = len(lx) + len(ly) - 1
+    log = max(1, (size - 1).bit_length())
+    if log > MAX_LOG:
+        # too long for the primes: one Karatsuba level on top
+        m = max(x.bit_length(), y.bit_length()) // 2
+        mask = (1 << m) - 1
+        x1, x0 = x >> m, x & mask
+        y1, y0 = y >> m, y & mask
+        z2 = ntt_multiply(x1, y1)
+        z0 = ntt_multiply(x0, y0)
+        z1 = ntt_multiply(x0 + x1, y0 + y1) - z2 - z0
+        return (z2 << (2 * m)) + (z1 << m) + z0
+    n = 1 << log
+
+    # both operands under both primes, transformed together
+    a = np.zeros((len(PRIMES), 2, n), dtype=np.int64)
+    a[:, 0, :len(lx)] = lx
+    a[:, 1, :len(ly)] = ly
+    _forward(a)
+    prod = a[:, 0, :] * a[:, 1, :] % _MOD[:, None]
+    _inverse(prod)
+
+    # CRT (Garner): the coefficient is r0 + p0 * t, which is below 2^60
+    r0 = prod[0, :size]
+    r1 = prod[1, :size]
+    t = (r1 - r0) % PRIMES[1] * _P0_INV % PRIMES[1]
+    return _from_coefficients(r0 + PRIMES[0] * t)
+
+
+def ntt_multiply(x, y):
+    """Product of two ints with a number-theoretic transform, O(n log n) NumPy work.
+
+    The operands are cut into 16-bit limbs. Their cyclic convolution is
+    computed modulo two NTT-friendly primes, with both operands and both
+    primes transformed in one vectorized pass. The exact coefficients are
+    rebuilt with the CRT and the carries are resolved through int.from_bytes.
+    Returns exactly x * y.
+    """
+    if x == 0 or y == 0:
+        return 0
+    if (x < 0) != (y < 0):
+        return -_ntt_mul(abs(x), abs(y))
+    return _ntt_mul(abs(x), abs(y))
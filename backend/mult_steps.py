@@ -0,0 +1,285 @@
+# Step-recording divide-and-conquer multiplication. Steps are produced by
+# generators, so nothing is built unless a caller consumes them; the product
+# of a generator is its return value (the value of `yield from`).
+
+from collections import OrderedDict
+
+# Methods that can record steps
+STEP_METHODS = ("karatsuba", "toom3")
+
+# Eviction policies of ProductCache
+CACHE_POLICIES = ("lru", "fifo")
+
+
+class ProductCache:
+    """Bounded memo of sub-products keyed on the (unordered) operand pair.
+
+    When full, "lru" evicts the entry used longest ago and "fifo" the one
+    stored first. Only products whose operands both have at least
+    min_digits digits are cached; raise it when lookups cost more than the
+    small products they save. hits, misses and evictions count lookups
+    across every product the cache is shared by.
+    """
+
+    def __init__(self, maxsize=4096, policy="lru", min_digits=2):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {CACHE_POLICIES}")
+        if min_digits < 2:
+            raise ValueError("min_digits must be at least 2")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.min_digits = min_digits
+        # smallest operand with min_digits digits
+        self.min_value = 10 ** (min_digits - 1)
+        self._data = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def _key(x, y):
+        return (x, y) if x <= y else (y, x)
+
+    def get(self, x, y):
+        """Cached x * y, or None on a miss"""
+        key = self._key(x, y)
+        product = self._data.get(key)
+        if product is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+        return product
+
+    def put(self, x, y, product):
+        self._data[self._key(x, y)] = product
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self):
+        """Counters as a dict (hits, misses, evictions, size, maxsize, policy)"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "min_digits": self.min_digits,
+        }
+
+
+def karatsuba_product(x, y, cache=None, counts=None):
+    """Same recursion as karatsuba_multiply, returning only the product (no step records).
+
+    With a ProductCache, sub-products above the base case are looked up
+    before recursing and stored afterwards. counts, a dict, has its
+    "splits" and "base_cases" entries incremented as the recursion runs.
+    """
+    if x < 10 or y < 10:
+        if counts is not None:
+            counts["base_cases"] = counts.get("base_cases", 0) + 1
+        return x * y
+    use_cache = cache is not None and x >= cache.min_value and y >= cache.min_value
+    if use_cache:
+        product = cache.get(x, y)
+        if product is not None:
+            return product
+
+    if counts is not None:
+        counts["splits"] = counts.get("splits", 0) + 1
+    m = max(len(str(x)), len(str(y))) // 2
+    high1, low1 = x // (10**m), x % (10**m)
+    high2, low2 = y // (10**m), y % (10**m)
+
+    z0 = karatsuba_product(low1, low2, cache, counts)
+    z1 = karatsuba_product((low1 + high1), (low2 + high2), cache, counts)
+    z2 = karatsuba_product(high1, high2, cache, counts)
+    result = z2 * (10**(2*m)) + (z1 - z2 - z0) * (10**m) + z0
+    if use_cache:
+        cache.put(x, y, result)
+    return result
+
+def karatsuba_node_counts(x, y):
+    """(splits, base cases) of the karatsuba_steps recursion, counted without building steps"""
+    if x < 10 or y < 10:
+        return 0, 1
+
+    m = max(len(str(x)), len(str(y))) // 2
+    high1, low1 = x // (10**m), x % (10**m)
+    high2, low2 = y // (10**m), y % (10**m)
+
+    splits, leaves = 1, 0
+    for u, v in ((low1, low2), (low1 + high1, low2 + high2), (high1, high2)):
+        s, b = karatsuba_node_counts(u, v)
+        splits += s
+        leaves += b
+    return splits, leaves
+
+def karatsuba_steps(x, y, cache=None):
+    """Generate karatsuba_multiply's step records (x, y, product, description) one at a time.
+
+    With a ProductCache a known sub-product is one "Cache hit" step instead of its subtree.
+    """
+    # Base case: if numbers are small enough, use regular multiplication
+    if x < 10 or y < 10:
+        yield (x, y, x * y, "Base case")
+        return x * y
+    use_cache = cache is not None and x >= cache.min_value and y >= cache.min_value
+    if use_cache:
+        product = cache.get(x, y)
+        if product is not None:
+            yield (x, y, product, "Cache hit")
+            return product
+
+    # Calculate the size of the numbers
+    n = max(len(str(x)), len(str(y)))
+    m = n // 2
+
+    # Split the digit sequences in the middle
+    high1, low1 = x // (10**m), x % (10**m)
+    high2, low2 = y // (10**m), y % (10**m)
+
+    # Recursive steps
+    z0 = yield from karatsuba_steps(low1, low2, cache)
+    z1 = yield from karatsuba_steps((low1 + high1), (low2 + high2), cache)
+    z2 = yield from karatsuba_steps(high1, high2, cache)
+
+    # Combine the results
+    result = z2 * (10**(2*m)) + (z1 - z2 - z0) * (10**m) + z0
+    if use_cache:
+        cache.put(x, y, result)
+    yield (x, y, result, f"Combine: z2*10^{2*m} + (z1-z2-z0)*10^{m} + z0")
+    return result
+
+def toom3_steps(x, y):
+    """Generate toom3_multiply's step records, in the same format as karatsuba_steps"""
+    if x < 0 or y < 0:
+        result = yield from toom3_steps(abs(x), abs(y))
+        if (x < 0) != (y < 0):
+            result = -result
+        yield (x, y, result, "Sign: multiply magnitudes and restore the sign")
+        return result
+    # Base case: if numbers are small enough, use regular multiplication
+    if x < 10 or y < 10:
+        yield (x, y, x * y, "Base case")
+        return x * y
+
+    # Split both numbers into three parts of k digits
+    n = max(len(str(x)), len(str(y)))
+    k = (n + 2) // 3
+    base = 10**k
+    x0, x1, x2 = x % base, (x // base) % base, x // (base * base)
+    y0, y1, y2 = y % base, (y // base) % base, y // (base * base)
+
+    # Evaluate at 0, 1, -1, -2 and infinity: five recursive products
+    v0 = yield from toom3_steps(x0, y0)
+    v1 = yield from toom3_steps(x0 + x1 + x2, y0 + y1 + y2)
+    vm1 = yield from toom3_steps(x0 - x1 + x2, y0 - y1 + y2)
+    vm2 = yield from toom3_steps(x0 - 2*x1 + 4*x2, y0 - 2*y1 + 4*y2)
+    vinf = yield from toom3_steps(x2, y2)
+
+    # Interpolate the coefficients r0..r4 of the product polynomial
+    r3 = (vm2 - v1) // 3
+    r1 = (v1 - vm1) // 2
+    r2 = vm1 - v0
+    r3 = (r2 - r3) // 2 + 2 * vinf
+    r2 = r2 + r1 - vinf
+    r1 = r1 - r3
+    result = v0 + r1 * base + r2 * base**2 + r3 * base**3 + vinf * base**4
+    yield (x, y, result, f"Combine: r4*10^{4*k} + r3*10^{3*k} + r2*10^{2*k} + r1*10^{k} + r0")
+    return result
+
+def run_steps(gen):
+    """Drain a step generator into (product, list of steps)"""
+    steps = []
+    while True:
+        try:
+            steps.append(next(gen))
+        except StopIteration as stop:
+            return stop.value, steps
+
+def karatsuba_multiply(x, y, cache=None):
+    """divide-and-conquer multiplication algorithm"""
+    return run_steps(karatsuba_steps(x, y, cache))
+
+def toom3_multiply(x, y):
+    """Toom-Cook 3-way divide-and-conquer multiplication, same step format as karatsuba_multiply"""
+    return run_steps(toom3_steps(x, y))
+
+def iter_steps(a, b, method="karatsuba", cache=None):
+    """Generate the displayed partial products of a * b as dicts; returns the product.
+
+    cache (a ProductCache) is supported by the karatsuba method only.
+    """
+    if method not in STEP_METHODS:
+        raise ValueError(f"Method {method!r} records no steps, expected one of {STEP_METHODS}")
+    if cache is not None and method != "karatsuba":
+        raise ValueError("A product cache is only supported by the karatsuba method")
+    steps = toom3_steps(a, b) if method == "toom3" else karatsuba_steps(a, b, cache)
+    while True:
+        try:
+            x, y, product, description = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        # Only include steps where at least one number has more than 1 digit
+        if description != "Base case" or (x >= 10 or y >= 10):
+            yield {
+                'x': x,
+                'y': y,
+                'product': product,
+                'description': description
+            }
+
+def multiply_with_steps(a, b, method="karatsuba", cache=None):
+    """Return final product and list of partial products using divide-and-conquer"""
+    return run_steps(iter_steps(a, b, method, cache))
+
+
+class StepCursor:
+    """Random access to a step generator: step k is generated the first time it is asked for.
+
+    Steps already produced are kept so the viewer can go back; len() is
+    `count` when the caller knows it, otherwise the generator is drained.
+    """
+
+    def __init__(self, steps, count=None):
+        self._it = iter(steps)
+        self._seen = []
+        self._count = count
+
+    def _fill(self, k):
+        while len(self._seen) <= k:
+            try:
+                self._seen.append(next(self._it))
+            except StopIteration:
+                self._count = len(self._seen)
+                return False
+        return True
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if k < 0 or not self._fill(k):
+            raise IndexError("step index out of range")
+        return self._seen[k]
+
+    def __len__(self):
+        if self._count is None:
+            self._fill(float("inf"))
+        return self._count
+
+    def __iter__(self):
+        k = 0
+        while self._fill(k):
+            yield self._seen[k]
+            k += 1
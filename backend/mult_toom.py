@@ -0,0 +1,63 @@
+import functools
+
+from backend.mult_karatsuba import LIMB_BITS
+
+# Products whose smaller operand has at most this many bits go straight to
+# int * int; tuned with benchmarks/bench_mult_methods.py
+TOOM3_CUTOFF = 1 << 16
+
+
+@functools.lru_cache(maxsize=256)
+def _mask(k):
+    return (1 << k) - 1
+
+
+def _part_bits(bits):
+    """Size k (in bits, limb aligned) of each of the three parts of a bits-long operand"""
+    return ((bits + 2) // 3 + LIMB_BITS - 1) // LIMB_BITS * LIMB_BITS
+
+
+def _toom3(x, y, cutoff):
+    # signed operands: evaluation at -1 and -2 can go negative
+    if x < 0:
+        return -_toom3(-x, y, cutoff)
+    if y < 0:
+        return -_toom3(x, -y, cutoff)
+    xb = x.bit_length()
+    yb = y.bit_length()
+    if xb <= cutoff or yb <= cutoff:
+        return x * y
+    k = _part_bits(max(xb, yb))
+    mask = _mask(k)
+    x0, x1, x2 = x & mask, (x >> k) & mask, x >> (2 * k)
+    y0, y1, y2 = y & mask, (y >> k) & mask, y >> (2 * k)
+
+    # evaluate at 0, 1, -1, -2 and infinity
+    p = x0 + x2
+    q = y0 + y2
+    xm1, ym1 = p - x1, q - y1
+    v0 = _toom3(x0, y0, cutoff)
+    v1 = _toom3(p + x1, q + y1, cutoff)
+    vm1 = _toom3(xm1, ym1, cutoff)
+    vm2 = _toom3(((xm1 + x2) << 1) - x0, ((ym1 + y2) << 1) - y0, cutoff)
+    vinf = _toom3(x2, y2, cutoff)
+
+    # interpolate (Bodrato's sequence); the divisions are exact
+    r3 = (vm2 - v1) // 3
+    r1 = (v1 - vm1) >> 1
+    r2 = vm1 - v0
+    r3 = ((r2 - r3) >> 1) + (vinf << 1)
+    r2 = r2 + r1 - vinf
+    r1 = r1 - r3
+    return v0 + (r1 << k) + (r2 << (2 * k)) + (r3 << (3 * k)) + (vinf << (4 * k))
+
+
+def toom3_fast(x, y, cutoff=TOOM3_CUTOFF):
+    """Toom-Cook 3-way product of two ints, O(n^1.465), without step recording.
+
+    Each operand is cut into three limb-aligned parts with shifts and masks,
+    the five products at 0, 1, -1, -2 and infinity are computed recursively
+    and the result is interpolated. Below `cutoff` bits the product is left
+    to int * int. Returns exactly x * y.
+    """
+    return _toom3(x, y, max(cutoff, LIMB_BITS))
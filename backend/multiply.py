@@ -0,0 +1,46 @@
+from backend.mult_karatsuba import karatsuba_fast
+from backend.mult_toom import toom3_fast
+
+METHODS = ("auto", "builtin", "karatsuba", "toom3", "ntt")
+
+# Crossovers for method="auto", in bits of the smaller operand, measured with
+# benchmarks/bench_mult_methods.py: below TOOM3_THRESHOLD CPython's own
+# multiply wins, from NTT_THRESHOLD on the transform beats Toom-3
+TOOM3_THRESHOLD = 1 << 18
+NTT_THRESHOLD = 24_000_000
+
+def _ntt(a, b):
+    # imported on first use: NumPy is only needed past NTT_THRESHOLD
+    from backend.mult_ntt import ntt_multiply
+    return ntt_multiply(a, b)
+
+
+_ENGINES = {
+    "builtin": lambda a, b: a * b,
+    "karatsuba": karatsuba_fast,
+    "toom3": toom3_fast,
+    "ntt": _ntt,
+}
+
+
+def choose_method(a, b):
+    """The method multiply(a, b, "auto") runs for these operands"""
+    bits = min(abs(a).bit_length(), abs(b).bit_length())
+    if bits >= NTT_THRESHOLD:
+        return "ntt"
+    if bits >= TOOM3_THRESHOLD:
+        return "toom3"
+    return "builtin"
+
+
+def multiply(a, b, method="auto"):
+    """Exact product a * b with the chosen algorithm (no step recording).
+
+    method is one of METHODS; "auto" picks by operand size using the
+    measured crossover thresholds above.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+    if method == "auto":
+        method = choose_method(a, b)
+    return _ENGINES[method](a, b)
@@ -0,0 +1,142 @@
+import io
+import os
+import warnings
+
+import numpy as np
+
+# Suffixes of the binary formats; both are opened with mmap instead of parsed
+NPY_SUFFIX = ".npy"
+RAW_SUFFIXES = (".f64", ".bin")
+
+
+def _skip_header(f):
+    """Move binary file f to its first point line and return the count header (None without one)"""
+    while True:
+        start = f.tell()
+        line = f.readline()
+        if not line:
+            return None
+        if line.strip():
+            break
+    try:
+        # if first line is integer, treat as count
+        return int(line)
+    except ValueError:
+        # first line wasn't integer: it is the first point
+        f.seek(start)
+        return None
+
+
+def _read_rows(f, max_rows=None, dim=None):
+    """Parse up to max_rows point lines of f into an (n, d) float64 array.
+
+    np.loadtxt parses in C and rejects lines whose number of values differs
+    from the first one; dim, when given, is the number every line must hold.
+    Blank lines are skipped and do not count towards max_rows.
+    """
+    if max_rows is not None and max_rows < 1:
+        return np.empty((0, dim or 2))
+    with warnings.catch_warnings():
+        # empty input, and the note that blank lines do not count towards max_rows
+        warnings.simplefilter("ignore", UserWarning)
+        rows = np.loadtxt(f, dtype=np.float64, ndmin=2, max_rows=max_rows)
+    if rows.size == 0:
+        return np.empty((0, dim or 2))
+    if dim is not None and rows.shape[1] != dim:
+        raise ValueError(f"Point data must contain {dim} coordinates per line")
+    return rows
+
+
+def parse_points(data):
+    """Parse the "count header + one point per line" text format held in memory into an (n, d) array"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    f = io.BytesIO(data)
+    return _read_rows(f, _skip_header(f))
+
+
+def read_points_text(path):
+    """Bulk-parse a text point file into a contiguous (n, d) float64 array.
+
+    d is the number of values on the first point line.
+    """
+    with open(path, "rb") as f:
+        return _read_rows(f, _skip_header(f))
+
+
+def load_points(path, mmap=True, dim=2):
+    """Load points from a text, .npy or raw float64 file as an (n, d) float64 array.
+
+    Binary files are memory-mapped (read-only) unless mmap=False, so opening
+    them costs nothing until the data is touched. Raw files do not store
+    their shape and are read as dim values per point; text and 2-D .npy
+    files carry their own dimension.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == NPY_SUFFIX:
+        arr = np.load(path, mmap_mode="r" if mmap else None)
+    elif suffix in RAW_SUFFIXES:
+        if mmap:
+            arr = np.memmap(path, dtype="<f8", mode="r")
+        else:
+            arr = np.fromfile(path, dtype="<f8")
+    else:
+        return read_points_text(path)
+    if arr.dtype != np.float64:
+        arr = arr.astype(np.float64)
+    return arr if arr.ndim == 2 else arr.reshape(-1, dim)
+
+
+def iter_point_chunks(path, chunk_size, dim=2):
+    """Yield the points of a file as (m, d) float64 arrays of at most chunk_size rows.
+
+    Binary files are sliced from a memory map; text files are parsed chunk
+    by chunk, so only one chunk is held in memory at a time.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == NPY_SUFFIX or suffix in RAW_SUFFIXES:
+        pts = load_points(path, dim=dim)
+        for start in range(0, len(pts), chunk_size):
+            yield pts[start:start + chunk_size]
+        return
+
+    with open(path, "rb") as f:
+        remaining = _skip_header(f)
+        dim = None
+        while remaining is None or remaining > 0:
+            count = chunk_size if remaining is None else min(chunk_size, remaining)
+            # loadtxt stops right after the last row it returns, so the next chunk starts there
+            chunk = _read_rows(f, count, dim)
+            if len(chunk) == 0:
+                return
+            dim = chunk.shape[1]
+            yield chunk
+            if remaining is not None:
+                remaining -= len(chunk)
+            if len(chunk) < count:
+                return
+
+
+def save_points(path, points):
+    """Write points as .npy (by suffix) or raw little-endian float64 x, y pairs"""
+    arr = np.ascontiguousarray(points, dtype=np.float64)
+    if arr.ndim != 2:
+        arr = arr.reshape(-1, 2)
+    if os.path.splitext(path)[1].lower() == NPY_SUFFIX:
+        np.save(path, arr)
+    else:
+        arr.astype("<f8", copy=False).tofile(path)
+
+
+# CLI run
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert point files to a memory-mappable binary format")
+    parser.add_argument('src', help='input point file (text, .npy or raw float64)')
+    parser.add_argument('dst', help='output file (.npy, or .f64/.bin for raw float64)')
+    parser.add_argument('--dim', type=int, default=2, help='values per point when src is a raw float64 file')
+    args = parser.parse_args()
+
+    pts = load_points(args.src, dim=args.dim)
+    save_points(args.dst, pts)
+    print(f"Wrote {len(pts)} points to {args.dst}")
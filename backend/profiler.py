@@ -0,0 +1,193 @@
+import math
+import os
+import sys
+import time
+
+if __package__ in (None, ""):
+    # running as `python backend/profiler.py`: make the backend package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.metrics import Metric, get_metric
+from backend.mult_steps import karatsuba_product
+from backend.trace import BASE_CASE, DUPLICATE, LEVEL, STRIP_SIZE
+
+# Growth models for fit_complexity, as functions of the input size
+MODELS = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log2(n),
+    "n^1.585": lambda n: n ** math.log2(3),
+    "n^2": lambda n: n * n,
+}
+
+
+class OpCounts:
+    """Operation counters of one divide-and-conquer closest pair run.
+
+    Passed to closest_pair in place of a Trace: it keeps counts of the
+    events instead of recording them. calls is the number of recursive
+    calls, max_depth the deepest level, strip_sizes[level] the points that
+    entered strips at that level; distance_evals is filled in by the
+    counting metric from counting_metric.
+    """
+
+    def __init__(self):
+        self.distance_evals = 0
+        self.calls = 0
+        self.max_depth = 0
+        self.base_cases = 0
+        self.duplicate_exits = 0
+        self.strip_sizes = {}
+
+    def bind(self, points, order=None):
+        pass
+
+    def emit(self, kind, level=0, a=-1, b=-1, n=0, x=0.0, d=0.0):
+        if kind == LEVEL:
+            self.calls += 1
+            if level > self.max_depth:
+                self.max_depth = level
+        elif kind == BASE_CASE:
+            self.base_cases += 1
+        elif kind == STRIP_SIZE:
+            self.strip_sizes[level] = self.strip_sizes.get(level, 0) + n
+        elif kind == DUPLICATE:
+            self.duplicate_exits += 1
+
+    def counting_metric(self, metric="euclidean"):
+        """Copy of metric whose distance function counts its calls into distance_evals"""
+        metric = get_metric(metric)
+        dist = metric.dist
+
+        def counted(p, q):
+            self.distance_evals += 1
+            return dist(p, q)
+        return Metric(metric.name, counted, metric.x_reach, metric.y_reach, metric.period)
+
+    def as_dict(self):
+        return {
+            "distance_evals": self.distance_evals,
+            "calls": self.calls,
+            "max_depth": self.max_depth,
+            "base_cases": self.base_cases,
+            "duplicate_exits": self.duplicate_exits,
+            "strip_points": sum(self.strip_sizes.values()),
+            "strip_sizes": dict(sorted(self.strip_sizes.items())),
+        }
+
+
+def count_closest_pair(points, metric="euclidean"):
+    """Operation counts (OpCounts.as_dict) of the python divide and conquer on points"""
+    from backend.closest_pair import closest_pair
+
+    counts = OpCounts()
+    closest_pair(points, counts, metric=counts.counting_metric(metric))
+    return counts.as_dict()
+
+
+def count_karatsuba(a, b):
+    """Node counts of the decimal Karatsuba recursion of a * b, counted by karatsuba_product as it runs"""
+    counts = {"splits": 0, "base_cases": 0}
+    karatsuba_product(a, b, counts=counts)
+    return {"nodes": counts["splits"] + counts["base_cases"], **counts}
+
+
+def fit_complexity(sizes, values):
+    """Best model of values against sizes.
+
+    Each model of MODELS is fitted as c * f(n) by least squares; the one with
+    the smallest RMS relative error wins. Returns (model, c, rms error,
+    exponent), where exponent is the log-log slope of the data.
+    """
+    if len(sizes) < 2:
+        raise ValueError("need at least two sizes to fit")
+    best = None
+    for name, f in MODELS.items():
+        fs = [f(n) for n in sizes]
+        c = sum(y * g for y, g in zip(values, fs)) / sum(g * g for g in fs)
+        if c <= 0:
+            continue
+        err = math.sqrt(sum((y / (c * g) - 1) ** 2 for y, g in zip(values, fs)) / len(fs))
+        if best is None or err < best[2]:
+            best = (name, c, err)
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(y, 1e-12)) for y in values]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+    name, c, err = best if best else (None, 0.0, float("inf"))
+    return name, c, err, slope
+
+
+def best_time(fn, repeat):
+    """(fastest of `repeat` runs of fn() in seconds, result of the last run)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def profile_closest(sizes, dist="uniform", seed=0, repeat=3):
+    """[(n, seconds, counts)] of the python divide and conquer over generated points"""
+    from backend.closest_inputfiles import generate_points
+    from backend.closest_pair import closest_pair
+
+    rows = []
+    for n in sizes:
+        points = list(map(tuple, generate_points(n, dist, seed, bound=max(1000, 100 * n)).tolist()))
+        t, _ = best_time(lambda: closest_pair(points), repeat)
+        rows.append((n, t, count_closest_pair(points)))
+    return rows
+
+
+def profile_karatsuba(sizes, seed=0, repeat=3):
+    """[(digits, seconds, counts)] of the decimal Karatsuba on random operands; counts come from the timed runs"""
+    from backend.mult_inputfiles import generate_numbers
+
+    rows = []
+    for digits in sizes:
+        a, b = generate_numbers(2, seed=seed, digits=digits)
+        t, counts = best_time(lambda: count_karatsuba(a, b), repeat)
+        rows.append((digits, t, counts))
+    return rows
+
+
+def print_fits(rows, keys):
+    sizes = [n for n, _, _ in rows]
+    series = [("time", [t for _, t, _ in rows])] + [(k, [c[k] for _, _, c in rows]) for k in keys]
+    print(f"\n{'measure':>15} {'best model':>10} {'constant':>12} {'rms err':>8} {'exponent':>8}")
+    for label, values in series:
+        name, c, err, slope = fit_complexity(sizes, values)
+        print(f"{label:>15} {name or '-':>10} {c:>12.4g} {err:>8.3f} {slope:>8.3f}")
+
+
+# CLI run
+if __name__ == "__main__":
+    import argparse
+    from backend.closest_inputfiles import DISTRIBUTIONS
+
+    parser = argparse.ArgumentParser(description="Sweep input sizes, count operations and fit a complexity model")
+    parser.add_argument('--algorithm', choices=("closest", "karatsuba"), default='closest')
+    parser.add_argument('--sizes', type=int, nargs='+', default=None,
+                        help='points (closest) or digits (karatsuba); default 1000..64000 / 50..1600')
+    parser.add_argument('--dist', choices=DISTRIBUTIONS, default='uniform', help='closest pair point layout')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.algorithm == "closest":
+        sizes = args.sizes or [1000, 2000, 4000, 8000, 16000, 32000, 64000]
+        rows = profile_closest(sizes, args.dist, args.seed, args.repeat)
+        keys = ["distance_evals", "calls", "base_cases", "strip_points"]
+        print(f"{'n':>8} {'time (s)':>9} {'dist evals':>11} {'calls':>8} {'depth':>5} {'base':>7} {'strip pts':>10}")
+        for n, t, c in rows:
+            print(f"{n:>8} {t:>9.4f} {c['distance_evals']:>11} {c['calls']:>8} {c['max_depth']:>5} "
+                  f"{c['base_cases']:>7} {c['strip_points']:>10}")
+    else:
+        sizes = args.sizes or [50, 100, 200, 400, 800, 1600]
+        rows = profile_karatsuba(sizes, args.seed, args.repeat)
+        keys = ["nodes", "base_cases"]
+        print(f"{'digits':>8} {'time (s)':>9} {'nodes':>9} {'splits':>9} {'base':>9}")
+        for n, t, c in rows:
+            print(f"{n:>8} {t:>9.4f} {c['nodes']:>9} {c['splits']:>9} {c['base_cases']:>9}")
+    print_fits(rows, keys)
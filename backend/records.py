@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+
+# Output formats of the command line tools; "text" is their human-readable default
+FORMATS = ("text", "json", "csv", "ndjson")
+
+# Records buffered before each write to the stream
+BUFFER_RECORDS = 4096
+
+
+def _cell(value):
+    """CSV cell of a record value: lists become space-separated, lists of lists ';'-separated"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (list, tuple)):
+            return ";".join(_cell(v) for v in value)
+        return " ".join(str(v) for v in value)
+    return value
+
+
+class RecordWriter:
+    """Write dict records to a text stream as one JSON array, CSV rows or NDJSON lines.
+
+    Records are buffered and serialized `buffer` at a time, so a stream of
+    any length costs one write per batch and constant memory. CSV takes its
+    header and column order from `fields`. close() (or leaving the with
+    block) flushes the rest and ends the JSON array.
+    """
+
+    def __init__(self, out, fmt, fields=None, buffer=BUFFER_RECORDS):
+        if fmt not in FORMATS or fmt == "text":
+            raise ValueError(f"Unknown record format {fmt!r}, expected one of {FORMATS[1:]}")
+        if fmt == "csv" and not fields:
+            raise ValueError("csv output needs field names")
+        self.out = out
+        self.fmt = fmt
+        self.fields = fields
+        self.buffer = max(1, buffer)
+        self.count = 0
+        self._pending = []
+        self._header_done = False
+
+    def write(self, record):
+        self._pending.append(record)
+        if len(self._pending) >= self.buffer:
+            self.flush()
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self.fmt == "csv" and not self._header_done:
+            self.out.write(",".join(self.fields) + "\n")
+            self._header_done = True
+        if not self._pending:
+            return
+        if self.fmt == "ndjson":
+            text = "".join(json.dumps(r) + "\n" for r in self._pending)
+        elif self.fmt == "json":
+            text = ("[\n" if self.count == 0 else ",\n") + ",\n".join(json.dumps(r) for r in self._pending)
+        else:
+            buf = io.StringIO()
+            csv.writer(buf, lineterminator="\n").writerows(
+                [_cell(r.get(f)) for f in self.fields] for r in self._pending)
+            text = buf.getvalue()
+        self.out.write(text)
+        self.count += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        if self.fmt == "json":
+            self.out.write("\n]\n" if self.count else "[]\n")
+        self.out.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,175 @@
+import heapq
+
+import numpy as np
+
+from backend.closest_nd import as_nd_array, closest_pair_nd_indices
+from backend.closest_numpy import closest_pair_numpy_indices
+from backend.trace import point_tuple
+
+# Nodes covering at most this many points are leaves scanned with numpy
+LEAF_SIZE = 16
+
+
+class PointIndex:
+    """KD-tree over a fixed point set (any dimension), built once and reused for many queries.
+
+    The tree is stored in flat arrays: perm orders the points so every node
+    covers perm[lo[k]:hi[k]]; inner nodes split on dim[k] at split[k] into
+    children left[k] / right[k] (dim is -1 for leaves). Queries return point
+    indices into self.points. The index (including a cached closest pair)
+    can be written with save() and reopened with PointIndex.load() without
+    rebuilding.
+    """
+
+    def __init__(self, points, leaf_size=LEAF_SIZE, _tree=None):
+        self.points = as_nd_array(points)
+        self._closest = None
+        if _tree is not None:
+            (self.perm, self.lo, self.hi, self.dim, self.split,
+             self.left, self.right) = _tree
+            return
+
+        n = len(self.points)
+        perm = np.arange(n)
+        lo, hi, dim, split, left, right = [], [], [], [], [], []
+
+        def new_node(a, b):
+            lo.append(a)
+            hi.append(b)
+            dim.append(-1)
+            split.append(0.0)
+            left.append(-1)
+            right.append(-1)
+            return len(lo) - 1
+
+        stack = [new_node(0, n)] if n else []
+        while stack:
+            k = stack.pop()
+            a, b = lo[k], hi[k]
+            if b - a <= leaf_size:
+                continue
+            sub = perm[a:b]
+            coords = self.points[sub]
+            # split the widest dimension at the median
+            d = int(np.argmax(coords.max(axis=0) - coords.min(axis=0)))
+            mid = (b - a) // 2
+            part = np.argpartition(coords[:, d], mid)
+            perm[a:b] = sub[part]
+            dim[k] = d
+            split[k] = float(self.points[perm[a + mid], d])
+            left[k] = new_node(a, a + mid)
+            right[k] = new_node(a + mid, b)
+            stack.append(left[k])
+            stack.append(right[k])
+
+        self.perm = perm
+        self.lo = np.array(lo, dtype=np.intp)
+        self.hi = np.array(hi, dtype=np.intp)
+        self.dim = np.array(dim, dtype=np.int8)
+        self.split = np.array(split, dtype=np.float64)
+        self.left = np.array(left, dtype=np.intp)
+        self.right = np.array(right, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _leaf(self, k, q):
+        """(indices, squared distances) of the points in leaf k"""
+        idx = self.perm[self.lo[k]:self.hi[k]]
+        diff = self.points[idx] - q
+        return idx, np.einsum('ij,ij->i', diff, diff)
+
+    def knn(self, q, k=1):
+        """The k nearest points to q as a list of (dist, index), nearest first"""
+        q = np.asarray(q, dtype=np.float64)
+        if k <= 0 or len(self.lo) == 0:
+            return []
+        heap = []  # max-heap on squared distance: (-d2, index)
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(heap) == k and bound >= -heap[0][0]:
+                continue
+            d = self.dim[node]
+            if d < 0:
+                idx, d2 = self._leaf(node, q)
+                for i, dd in zip(idx.tolist(), d2.tolist()):
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-dd, i))
+                    elif dd < -heap[0][0]:
+                        heapq.heapreplace(heap, (-dd, i))
+                continue
+            diff = q[d] - self.split[node]
+            near, far = ((self.left[node], self.right[node]) if diff < 0
+                         else (self.right[node], self.left[node]))
+            # the far side is at least |diff| away; visit the near side first
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        return [(float(np.sqrt(-nd)), i) for nd, i in sorted(heap, reverse=True)]
+
+    def nearest(self, q):
+        """Nearest point to q as (dist, index)"""
+        found = self.knn(q, 1)
+        return found[0] if found else (None, None)
+
+    def radius(self, q, r):
+        """All points within distance r of q as a list of (dist, index), nearest first"""
+        q = np.asarray(q, dtype=np.float64)
+        r2 = r * r
+        out_idx, out_d2 = [], []
+        stack = [0] if len(self.lo) else []
+        while stack:
+            node = stack.pop()
+            d = self.dim[node]
+            if d < 0:
+                idx, d2 = self._leaf(node, q)
+                keep = d2 <= r2
+                out_idx.append(idx[keep])
+                out_d2.append(d2[keep])
+                continue
+            diff = q[d] - self.split[node]
+            if diff <= 0 or diff * diff <= r2:
+                stack.append(self.left[node])
+            if diff >= 0 or diff * diff <= r2:
+                stack.append(self.right[node])
+        if not out_idx:
+            return []
+        idx = np.concatenate(out_idx)
+        d2 = np.concatenate(out_d2)
+        order = np.argsort(d2, kind="stable")
+        return list(zip(np.sqrt(d2[order]).tolist(), idx[order].tolist()))
+
+    def closest_pair_indices(self):
+        """(min_dist, i, j) of the indexed points, computed once and cached"""
+        if self._closest is None and len(self.points) >= 2:
+            if self.points.shape[1] == 2:
+                self._closest = closest_pair_numpy_indices(self.points)
+            else:
+                self._closest = closest_pair_nd_indices(self.points)
+        return self._closest
+
+    def closest_pair(self):
+        """Closest pair of the indexed points as (min_dist, pair), like closest_pair()"""
+        if len(self.points) < 2:
+            return None, None
+        d, i, j = self.closest_pair_indices()
+        return d, (point_tuple(self.points, i), point_tuple(self.points, j))
+
+    def save(self, path):
+        """Write points, tree arrays and the cached closest pair to an .npz file"""
+        self.closest_pair_indices()
+        closest = np.array(self._closest if self._closest is not None else [], dtype=np.float64)
+        np.savez(path, points=self.points, perm=self.perm, lo=self.lo, hi=self.hi,
+                 dim=self.dim, split=self.split, left=self.left, right=self.right,
+                 closest=closest)
+
+    @classmethod
+    def load(cls, path):
+        """Open an index written by save() (path or file object) without rebuilding it"""
+        with np.load(path) as data:
+            tree = tuple(data[name] for name in ("perm", "lo", "hi", "dim", "split", "left", "right"))
+            index = cls(data["points"], _tree=tree)
+            closest = data["closest"]
+        if len(closest):
+            index._closest = (float(closest[0]), int(closest[1]), int(closest[2]))
+        return index
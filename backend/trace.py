@@ -0,0 +1,185 @@
+from array import array
+
+# Event kinds for the closest pair trace. Field usage per kind:
+#   SETUP          n = total points
+#   LEVEL          n = points handled at this level
+#   BASE_CASE      [a, b) = slice of the x order solved by brute force
+#   BRUTE_MIN      a, b = point indices, d = new minimum
+#   BRUTE_RESULT   d = base case result
+#   DIVIDE         x = split line, a / b = left / right sizes
+#   CONQUER_LEFT, CONQUER_RIGHT
+#   COMBINE        x = left distance, d = right distance
+#   TAKE_LEFT, TAKE_RIGHT
+#   DUPLICATE      (distance 0 found, rest of the level skipped)
+#   STRIP          x = split line, d = strip half-width
+#   STRIP_SIZE     n = points in the strip
+#   STRIP_MIN      a, b = point indices, d = new minimum
+#   STRIP_DONE     n = 1 if the strip improved the result, d = level result
+#   FINAL          a, b = point indices, d = minimum distance
+#   NOTE           a = index into NOTES
+(SETUP, LEVEL, BASE_CASE, BRUTE_MIN, BRUTE_RESULT, DIVIDE, CONQUER_LEFT,
+ CONQUER_RIGHT, COMBINE, TAKE_LEFT, TAKE_RIGHT, DUPLICATE, STRIP, STRIP_SIZE,
+ STRIP_MIN, STRIP_DONE, FINAL, NOTE) = range(18)
+
+NOTES = (
+    "NumPy engine: step-by-step trace is only recorded by the python engine",
+    "Grid algorithm: randomized hash-grid search (no divide-and-conquer steps)",
+    "Parallel engine: top levels solved in worker processes (no step-by-step trace)",
+    "N-dimensional engine: grid or blocked brute force over d coordinates (no step-by-step trace)",
+)
+
+# Recorded even when the buffer is capped so a trace always ends with the answer
+ALWAYS_KEPT = (SETUP, FINAL, NOTE)
+
+
+def point_tuple(points, i):
+    """Point i as a plain tuple (array rows are converted to floats)"""
+    p = points[i]
+    return p if isinstance(p, tuple) else tuple(float(v) for v in p)
+
+
+class Trace:
+    """Compact event log for the closest pair algorithm.
+
+    Events are stored as rows of typed columns (kind, level, a, b, n, x, d)
+    in preallocated arrays; no text is built while the algorithm runs.
+    render(k) formats a single event on demand, and indexing/iterating a
+    Trace yields rendered lines, so it can stand in for the old list of steps.
+
+    For large inputs the buffer can be bounded: limit caps the number of
+    recorded events and max_depth drops events below a recursion depth.
+    Dropped events are counted in self.dropped.
+    """
+
+    def __init__(self, points=None, capacity=256, limit=None, max_depth=None):
+        self.points = points
+        self.order = None
+        self.limit = limit
+        self.max_depth = max_depth
+        self.size = 0
+        self.dropped = 0
+        self.capacity = capacity
+        self.kind = array('B', bytes(capacity))
+        self.level = array('h', bytes(2 * capacity))
+        self.a = array('q', bytes(8 * capacity))
+        self.b = array('q', bytes(8 * capacity))
+        self.n = array('q', bytes(8 * capacity))
+        self.x = array('d', bytes(8 * capacity))
+        self.d = array('d', bytes(8 * capacity))
+
+    @classmethod
+    def capped(cls, points, per_point=16):
+        """Trace whose size is bounded by per_point * n * log2(n) events"""
+        n = max(len(points), 2)
+        return cls(points, limit=per_point * n * n.bit_length())
+
+    def bind(self, points, order=None):
+        """Attach the point list (and x order) that event indices refer to"""
+        self.points = points
+        self.order = order
+
+    def _grow(self):
+        extra = self.capacity
+        for col in (self.kind, self.level, self.a, self.b, self.n, self.x, self.d):
+            col.frombytes(bytes(col.itemsize * extra))
+        self.capacity += extra
+
+    def emit(self, kind, level=0, a=-1, b=-1, n=0, x=0.0, d=0.0):
+        if kind not in ALWAYS_KEPT:
+            if self.max_depth is not None and level > self.max_depth:
+                self.dropped += 1
+                return
+            if self.limit is not None and self.size >= self.limit:
+                self.dropped += 1
+                return
+        if self.size == self.capacity:
+            self._grow()
+        k = self.size
+        self.kind[k] = kind
+        self.level[k] = level
+        self.a[k] = a
+        self.b[k] = b
+        self.n[k] = n
+        self.x[k] = x
+        self.d[k] = d
+        self.size = k + 1
+
+    def event(self, k):
+        """Raw fields of event k as (kind, level, a, b, n, x, d)"""
+        return (self.kind[k], self.level[k], self.a[k], self.b[k],
+                self.n[k], self.x[k], self.d[k])
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += self.size
+        if not 0 <= k < self.size:
+            raise IndexError("trace index out of range")
+        return self.render(k)
+
+    def __iter__(self):
+        for k in range(self.size):
+            yield self.render(k)
+
+    def point(self, i):
+        return point_tuple(self.points, i)
+
+    def render(self, k):
+        """Text for event k (possibly several lines)"""
+        kind, level, a, b, n, x, d = self.event(k)
+        pt = self.point
+        indent = "  " * level
+        if kind == SETUP:
+            lines = ["Initial setup:", f"  Total points: {n}",
+                     "  Sorting points by x-coordinate...",
+                     "  Sorting points by y-coordinate...",
+                     "Starting divide-and-conquer algorithm...", "=" * 50]
+            return "\n".join(lines)
+        if kind == LEVEL:
+            return f"{indent}Level {level}: Processing {n} points"
+        if kind == BASE_CASE:
+            chunk = [pt(i) for i in self.order[a:b]] if self.order is not None else []
+            return (f"{indent}Base case reached (n <= 3), using brute force\n"
+                    f"  Brute force on {b - a} points: {chunk}")
+        if kind == BRUTE_MIN:
+            return f"    New min distance: {d:.4f} between {pt(a)} and {pt(b)}"
+        if kind == BRUTE_RESULT:
+            return f"  Brute force result: distance = {d:.4f}"
+        if kind == DIVIDE:
+            return (f"{indent}DIVIDE: Splitting at x = {x:.2f}\n"
+                    f"{indent}  Left half: {a} points\n"
+                    f"{indent}  Right half: {b} points")
+        if kind == CONQUER_LEFT:
+            return f"{indent}CONQUER: Recursively solving left half"
+        if kind == CONQUER_RIGHT:
+            return f"{indent}CONQUER: Recursively solving right half"
+        if kind == COMBINE:
+            return (f"{indent}COMBINE: Comparing results from left and right\n"
+                    f"{indent}  Left min distance: {x:.4f}\n"
+                    f"{indent}  Right min distance: {d:.4f}")
+        if kind == TAKE_LEFT:
+            return f"{indent}  Taking left result (smaller distance)"
+        if kind == TAKE_RIGHT:
+            return f"{indent}  Taking right result (smaller distance)"
+        if kind == DUPLICATE:
+            return f"{indent}Duplicate points found (distance 0), skipping the rest of this level"
+        if kind == STRIP:
+            return f"{indent}Checking strip around midline x = {x:.2f} ± {d:.4f}"
+        if kind == STRIP_SIZE:
+            return f"{indent}  Strip contains {n} points"
+        if kind == STRIP_MIN:
+            return (f"{indent}  🎯 New closest pair in strip: {pt(a)} and {pt(b)}\n"
+                    f"{indent}  New min distance: {d:.4f}")
+        if kind == STRIP_DONE:
+            head = (f"{indent}✓ Strip check improved the result" if n
+                    else f"{indent}  Strip check didn't improve result")
+            return f"{head}\n{indent}Final result at level {level}: distance = {d:.4f}"
+        if kind == FINAL:
+            return ("=" * 50 + "\nFINAL RESULT:\n"
+                    f"  Closest pair: {pt(a)} and {pt(b)}\n"
+                    f"  Minimum distance: {d:.6f}")
+        if kind == NOTE:
+            return NOTES[a]
+        return f"{indent}<event {kind}>"
@@ -0,0 +1,154 @@
+"""Allocation benchmark: set-based closest_pair_rec vs index-based closest_pair_rec_idx.
+
+Reports time, peak traced bytes and the peak number of live memory blocks.
+closest_pair_rec is the original divide and conquer on tuple lists, kept
+here (without step output) as the baseline.
+
+Run from the repository root:
+    python benchmarks/bench_closest_alloc.py --sizes 1000 10000 100000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.closest_pair import closest_pair_rec_idx, sort_indices
+
+
+# Brute force for small n
+def brute_force(points):
+    min_d = float('inf')
+    pair = (None, None)
+    n = len(points)
+    for i in range(n):
+        for j in range(i+1, n):
+            d = math.dist(points[i], points[j])
+            if d < min_d:
+                min_d = d
+                pair = (points[i], points[j])
+    return min_d, pair
+
+
+# Original D&C on tuple lists (set-based split)
+def closest_pair_rec(px, py):
+    n = len(px)
+    if n <= 3:
+        return brute_force(px)
+
+    # DIVIDE PHASE
+    mid = n // 2
+    midx = px[mid][0]
+    Qx = px[:mid]
+    Rx = px[mid:]
+
+    # Maintain y-sorted lists for left/right
+    Qy = []
+    Ry = []
+    left_set = set(Qx)
+    for p in py:
+        if p in left_set:
+            Qy.append(p)
+        else:
+            Ry.append(p)
+
+    # CONQUER PHASE
+    dl, pair_l = closest_pair_rec(Qx, Qy)
+    dr, pair_r = closest_pair_rec(Rx, Ry)
+
+    # COMBINE PHASE
+    d, pair = (dl, pair_l) if dl < dr else (dr, pair_r)
+
+    # Check strip around midline
+    strip = [p for p in py if abs(p[0] - midx) < d]
+    for i in range(len(strip)):
+        j = i + 1
+        while j < len(strip) and (strip[j][1] - strip[i][1]) < d:
+            curd = math.dist(strip[i], strip[j])
+            if curd < d:
+                d = curd
+                pair = (strip[i], strip[j])
+            j += 1
+    return d, pair
+
+
+def run_sets(points):
+    px = sorted(points, key=lambda p: (p[0], p[1]))
+    py = sorted(points, key=lambda p: (p[1], p[0]))
+    return closest_pair_rec(px, py)
+
+
+def run_indices(points):
+    px, py, rank = sort_indices(points)
+    return closest_pair_rec_idx(points, px, py, rank, 0, len(points))
+
+
+def live_blocks():
+    """Memory blocks traced by tracemalloc right now, outside tracemalloc itself"""
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    return sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def peak_blocks(fn, points, growth=1.25):
+    """Most traced memory blocks live at once while fn(points) runs, above those live before it.
+
+    A snapshot is taken on a call or return whenever traced memory has grown
+    by `growth` since the last one, so the count is sampled near the peak.
+    """
+    tracemalloc.start()
+    base = peak = live_blocks()
+    last = tracemalloc.get_traced_memory()[0]
+
+    def sample(frame, event, arg):
+        nonlocal peak, last
+        current = tracemalloc.get_traced_memory()[0]
+        if current > last * growth:
+            last = current
+            peak = max(peak, live_blocks())
+    sys.setprofile(sample)
+    try:
+        fn(points)
+    finally:
+        sys.setprofile(None)
+        tracemalloc.stop()
+    return peak - base
+
+
+def measure(fn, points):
+    """Return (result, seconds, peak traced bytes, peak blocks); timing, tracing and counting are separate runs"""
+    start = time.perf_counter()
+    fn(points)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = fn(points)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak, peak_blocks(fn, points)
+
+
+def make_points(n, dist, rng):
+    if dist == "dup":
+        # few distinct x values: many duplicates straddle every split
+        return [(float(rng.randint(0, 9)), float(rng.randint(0, n))) for _ in range(n)]
+    return [(float(rng.randint(0, 10 * n)), float(rng.randint(0, 10 * n))) for _ in range(n)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--dist', choices=["uniform", "dup"], nargs='+', default=["uniform", "dup"])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'dist':>8} {'n':>8} {'core':>8} {'time (s)':>10} {'peak (KiB)':>12} {'peak blocks':>12}")
+    for dist in args.dist:
+        for n in args.sizes:
+            points = make_points(n, dist, random.Random(args.seed))
+            for name, fn in (("sets", run_sets), ("indices", run_indices)):
+                (d, _), elapsed, peak, blocks = measure(fn, points)
+                print(f"{dist:>8} {n:>8} {name:>8} {elapsed:>10.4f} {peak / 1024:>12.1f} {blocks:>12}  d={d:.4f}")
@@ -0,0 +1,59 @@
+"""Grid vs divide-and-conquer closest pair on uniform, clustered and collinear inputs.
+
+Run from the repository root:
+    python benchmarks/bench_closest_grid.py --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.closest_pair import closest_pair
+
+
+def make_points(n, dist, rng):
+    if dist == "clustered":
+        # a few tight gaussian blobs in a large square
+        centers = [(rng.uniform(0, 1e6), rng.uniform(0, 1e6)) for _ in range(10)]
+        pts = []
+        for _ in range(n):
+            cx, cy = rng.choice(centers)
+            pts.append((rng.gauss(cx, 1e3), rng.gauss(cy, 1e3)))
+        return pts
+    if dist == "collinear":
+        # every point on one line: the divide-and-conquer strips hold everything
+        return [(t, 2.0 * t + 1.0) for t in (rng.uniform(0, 1e6) for _ in range(n))]
+    return [(rng.uniform(0, 1e6), rng.uniform(0, 1e6)) for _ in range(n)]
+
+
+VARIANTS = {
+    "dc-python": dict(engine="python", algorithm="dc"),
+    "dc-numpy": dict(engine="numpy", algorithm="dc"),
+    "grid": dict(algorithm="grid"),
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--dist', choices=["uniform", "clustered", "collinear"], nargs='+',
+                        default=["uniform", "clustered", "collinear"])
+    parser.add_argument('--variants', choices=list(VARIANTS), nargs='+', default=list(VARIANTS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'dist':>10} {'n':>8} {'variant':>10} {'best (s)':>10}  distance")
+    for dist in args.dist:
+        for n in args.sizes:
+            points = make_points(n, dist, random.Random(args.seed))
+            for name in args.variants:
+                times = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    d, _ = closest_pair(points, **VARIANTS[name])
+                    times.append(time.perf_counter() - start)
+                print(f"{dist:>10} {n:>8} {name:>10} {min(times):>10.4f}  {d:.6g}")
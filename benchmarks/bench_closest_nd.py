@@ -0,0 +1,76 @@
+"""Closest pair in d = 2..16 dimensions: grid vs blocked brute force, uniform and clustered inputs.
+
+Run from the repository root:
+    python benchmarks/bench_closest_nd.py --sizes 10000 50000 --dims 2 3 4 8 16
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import closest_nd
+
+# The forced grid visits 3^d / 2 neighbour offsets; beyond this it takes minutes
+GRID_BENCH_MAX_DIM = 8
+
+
+def make_points(n, d, dist, rng):
+    if dist == "clustered":
+        # tight gaussian blobs in a large cube
+        centers = rng.uniform(0, 1e6, (10, d))
+        return centers[rng.integers(0, 10, n)] + rng.normal(0, 1e3, (n, d))
+    return rng.uniform(0, 1e6, (n, d))
+
+
+def run_grid(pts):
+    d2, i, j = closest_nd._grid(pts, np.random.default_rng(0))
+    return float(np.sqrt(d2))
+
+
+def run_brute(pts):
+    d2, i, j = closest_nd._brute_force(pts)
+    return float(np.sqrt(d2))
+
+
+def run_auto(pts):
+    return closest_nd.closest_pair_nd_indices(pts)[0]
+
+
+VARIANTS = {
+    "auto": run_auto,
+    "grid": run_grid,
+    "brute": run_brute,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--dims', type=int, nargs='+', default=list(range(2, 17)))
+    parser.add_argument('--dist', choices=["uniform", "clustered"], nargs='+',
+                        default=["uniform", "clustered"])
+    parser.add_argument('--variants', choices=list(VARIANTS), nargs='+', default=list(VARIANTS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"auto uses the grid up to d = {closest_nd.GRID_MAX_DIM}")
+    print(f"{'dist':>10} {'d':>3} {'n':>8} {'variant':>8} {'best (s)':>10}  distance")
+    for dist in args.dist:
+        for d in args.dims:
+            for n in args.sizes:
+                pts = make_points(n, d, dist, np.random.default_rng(args.seed))
+                for name in args.variants:
+                    if name == "grid" and d > GRID_BENCH_MAX_DIM:
+                        print(f"{dist:>10} {d:>3} {n:>8} {name:>8} {'skipped':>10}")
+                        continue
+                    times = []
+                    for _ in range(args.repeat):
+                        start = time.perf_counter()
+                        result = VARIANTS[name](pts)
+                        times.append(time.perf_counter() - start)
+                    print(f"{dist:>10} {d:>3} {n:>8} {name:>8} {min(times):>10.4f}  {result:.6g}")
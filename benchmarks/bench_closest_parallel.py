@@ -0,0 +1,38 @@
+"""Scaling benchmark for the multi-process closest pair (1/2/4/8 workers).
+
+Run from the repository root:
+    python benchmarks/bench_closest_parallel.py --n 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.closest_parallel import closest_pair_parallel_indices
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=2_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pts = np.random.default_rng(args.seed).random((args.n, 2))
+    print(f"n = {args.n}, cpus = {os.cpu_count()}")
+    print(f"{'workers':>8} {'best (s)':>10} {'speedup':>8}  distance")
+    base = None
+    for w in args.workers:
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            d, _, _ = closest_pair_parallel_indices(pts, w)
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        base = base or best
+        print(f"{w:>8} {best:>10.4f} {base / best:>8.2f}  {d:.6g}")
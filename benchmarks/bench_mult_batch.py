@@ -0,0 +1,50 @@
+"""Multiplications per second of the step, fast and batch engines on many operand pairs.
+
+Run from the repository root:
+    python benchmarks/bench_mult_batch.py --pairs 1000 100000 1000000
+    python benchmarks/bench_mult_batch.py --pairs 10000 --max-value 1000000000000000000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.mult_batch import multiply_batch
+from backend.mult_steps import multiply_with_steps
+from backend.multiply import multiply
+
+ENGINES = {
+    "steps": lambda n1, n2: [multiply_with_steps(a, b)[0] for a, b in zip(n1, n2)],
+    "fast": lambda n1, n2: [multiply(a, b) for a, b in zip(n1, n2)],
+    "batch": multiply_batch,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pairs', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--max-value', type=int, default=10**6, help='operands are drawn from [0, max-value]')
+    parser.add_argument('--engines', choices=list(ENGINES), nargs='+', default=list(ENGINES))
+    parser.add_argument('--steps-max', type=int, default=10000,
+                        help='most pairs given to the step-recording engine')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'pairs':>9} {'engine':>7} {'time (s)':>10} {'mult/s':>14}")
+    for pairs in args.pairs:
+        nums1 = [rng.randint(0, args.max_value) for _ in range(pairs)]
+        nums2 = [rng.randint(0, args.max_value) for _ in range(pairs)]
+        expected = [a * b for a, b in zip(nums1, nums2)]
+        for name in args.engines:
+            if name == "steps" and pairs > args.steps_max:
+                print(f"{pairs:>9} {name:>7} {'skipped':>10}")
+                continue
+            start = time.perf_counter()
+            products = ENGINES[name](nums1, nums2)
+            t = time.perf_counter() - start
+            assert products == expected, f"{name} gave a wrong product"
+            print(f"{pairs:>9} {name:>7} {t:>10.5f} {pairs / t:>14,.0f}")
@@ -0,0 +1,81 @@
+"""Bit-split Karatsuba vs the step-recording Karatsuba vs built-in int * int at 10^2..10^6 digits.
+
+Run from the repository root:
+    python benchmarks/bench_mult_karatsuba.py --digits 100 1000 10000 100000 1000000
+    python benchmarks/bench_mult_karatsuba.py --tune --digits 100000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.mult_steps import karatsuba_multiply
+from backend.mult_karatsuba import KARATSUBA_CUTOFF, karatsuba_fast
+
+
+def make_operand(digits, rng):
+    return rng.randrange(10 ** (digits - 1), 10 ** digits)
+
+
+def best_time(fn, a, b, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(a, b)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+VARIANTS = {
+    "builtin": lambda a, b: a * b,
+    "fast": karatsuba_fast,
+    # the decimal-string version records every step; it recurses to single digits
+    "steps": karatsuba_multiply,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--digits', type=int, nargs='+', default=[100, 1000, 10000, 100000, 1000000])
+    parser.add_argument('--variants', choices=list(VARIANTS), nargs='+', default=list(VARIANTS))
+    parser.add_argument('--steps-max', type=int, default=1000,
+                        help='largest operand (digits) given to the step-recording version')
+    parser.add_argument('--tune', action='store_true', help='sweep the base-case cutoff of the fast engine')
+    parser.add_argument('--cutoffs', type=int, nargs='+', default=[256, 1024, 4096, 16384, 65536, 262144])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.tune:
+        print(f"current KARATSUBA_CUTOFF = {KARATSUBA_CUTOFF} bits")
+        print(f"{'digits':>8} {'cutoff':>8} {'best (s)':>10} {'vs builtin':>10}")
+        for digits in args.digits:
+            a, b = make_operand(digits, rng), make_operand(digits, rng)
+            base = best_time(VARIANTS["builtin"], a, b, args.repeat)
+            for cutoff in args.cutoffs:
+                t = best_time(lambda x, y: karatsuba_fast(x, y, cutoff), a, b, args.repeat)
+                print(f"{digits:>8} {cutoff:>8} {t:>10.5f} {t / base:>9.2f}x")
+    else:
+        print(f"{'digits':>8} {'variant':>8} {'best (s)':>10} {'vs builtin':>10}")
+        for digits in args.digits:
+            a, b = make_operand(digits, rng), make_operand(digits, rng)
+            expected = a * b
+            base = None
+            for name in args.variants:
+                if name == "steps" and digits > args.steps_max:
+                    print(f"{digits:>8} {name:>8} {'skipped':>10}")
+                    continue
+                fn = VARIANTS[name]
+                result = fn(a, b)
+                if isinstance(result, tuple):
+                    result = result[0]
+                assert result == expected, f"{name} gave a wrong product at {digits} digits"
+                t = best_time(fn, a, b, args.repeat)
+                if name == "builtin":
+                    base = t
+                ratio = f"{t / base:>9.2f}x" if base else ""
+                print(f"{digits:>8} {name:>8} {t:>10.5f} {ratio:>10}")
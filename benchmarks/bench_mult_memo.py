@@ -0,0 +1,90 @@
+"""Karatsuba with and without the sub-product cache on random, repetitive-digit and shared-prefix inputs.
+
+Run from the repository root:
+    python benchmarks/bench_mult_memo.py --digits 200 1000 --pairs 50
+    python benchmarks/bench_mult_memo.py --sizes 256 4096 65536 --policies lru fifo --min-digits 2 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.mult_steps import CACHE_POLICIES, ProductCache, karatsuba_product, multiply_with_steps
+
+
+def random_pairs(digits, pairs, rng):
+    return [(rng.randrange(10 ** (digits - 1), 10 ** digits), rng.randrange(10 ** (digits - 1), 10 ** digits))
+            for _ in range(pairs)]
+
+
+def repetitive_pairs(digits, pairs, rng):
+    """Operands built by repeating a short digit block, e.g. 123123123..."""
+    out = []
+    for _ in range(pairs):
+        a, b = (str(rng.randrange(1, 1000)) for _ in range(2))
+        out.append((int((a * digits)[:digits]), int((b * digits)[:digits])))
+    return out
+
+
+def shared_prefix_pairs(digits, pairs, rng):
+    """Operands sharing their leading 90% of digits, only the tail varies"""
+    tail = max(1, digits // 10)
+    head_a = rng.randrange(10 ** (digits - tail - 1), 10 ** (digits - tail))
+    head_b = rng.randrange(10 ** (digits - tail - 1), 10 ** (digits - tail))
+    return [(head_a * 10 ** tail + rng.randrange(10 ** tail), head_b * 10 ** tail + rng.randrange(10 ** tail))
+            for _ in range(pairs)]
+
+
+INPUTS = {
+    "random": random_pairs,
+    "repetitive": repetitive_pairs,
+    "shared-prefix": shared_prefix_pairs,
+}
+
+ENGINES = {
+    "product": karatsuba_product,
+    "steps": lambda a, b, cache: multiply_with_steps(a, b, cache=cache)[0],
+}
+
+
+def run(fn, pairs, cache):
+    start = time.perf_counter()
+    for a, b in pairs:
+        assert fn(a, b, cache) == a * b
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--digits', type=int, nargs='+', default=[200, 1000])
+    parser.add_argument('--pairs', type=int, default=50, help='pairs per input, sharing one cache')
+    parser.add_argument('--inputs', choices=list(INPUTS), nargs='+', default=list(INPUTS))
+    parser.add_argument('--engines', choices=list(ENGINES), nargs='+', default=list(ENGINES))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4096], help='cache sizes to try')
+    parser.add_argument('--policies', choices=CACHE_POLICIES, nargs='+', default=['lru'])
+    parser.add_argument('--min-digits', type=int, nargs='+', default=[2],
+                        help='smallest operands (digits) whose products are cached')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'input':>13} {'digits':>6} {'engine':>7} {'cache':>14} {'time (s)':>9} {'speedup':>8} {'hit rate':>8}")
+    for kind in args.inputs:
+        for digits in args.digits:
+            pairs = INPUTS[kind](digits, args.pairs, rng)
+            for engine in args.engines:
+                fn = ENGINES[engine]
+                base = run(fn, pairs, None)
+                print(f"{kind:>13} {digits:>6} {engine:>7} {'off':>14} {base:>9.4f}")
+                for policy in args.policies:
+                    for size in args.sizes:
+                        for min_digits in args.min_digits:
+                            cache = ProductCache(size, policy, min_digits)
+                            t = run(fn, pairs, cache)
+                            rate = cache.hits / max(1, cache.hits + cache.misses)
+                            label = f"{policy} {size} >={min_digits}"
+                            print(f"{kind:>13} {digits:>6} {engine:>7} {label:>14} {t:>9.4f} {base / t:>7.2f}x "
+                                  f"{rate:>8.1%}")
@@ -0,0 +1,66 @@
+"""Built-in, Karatsuba, Toom-3, NTT and auto multiplication across operand sizes, with measured crossovers.
+
+Run from the repository root:
+    python benchmarks/bench_mult_methods.py --digits 10000 100000 1000000 3000000 10000000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.multiply import METHODS, NTT_THRESHOLD, TOOM3_THRESHOLD, choose_method, multiply
+
+
+def best_time(method, a, b, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        multiply(a, b, method)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def crossover(sizes, slow, fast):
+    """First size (in digits) from which `fast` stays ahead of `slow`, or None"""
+    found = None
+    for digits in sizes:
+        if fast[digits] < slow[digits]:
+            if found is None:
+                found = digits
+        else:
+            found = None
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--digits', type=int, nargs='+',
+                        default=[1000, 10000, 30000, 100000, 300000, 1000000, 3000000])
+    parser.add_argument('--methods', choices=METHODS, nargs='+', default=list(METHODS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    timings = {m: {} for m in args.methods}
+    print(f"{'digits':>9} {'method':>9} {'best (s)':>10}")
+    for digits in args.digits:
+        bits = int(digits * math.log2(10))
+        a, b = rng.getrandbits(bits) | 1 << (bits - 1), rng.getrandbits(bits) | 1 << (bits - 1)
+        expected = a * b
+        for method in args.methods:
+            assert multiply(a, b, method) == expected, f"{method} gave a wrong product at {digits} digits"
+            timings[method][digits] = t = best_time(method, a, b, args.repeat)
+            label = f"{method} ({choose_method(a, b)})" if method == "auto" else method
+            print(f"{digits:>9} {label:>9} {t:>10.5f}")
+
+    print(f"\ncurrent thresholds: toom3 from {TOOM3_THRESHOLD} bits (~{int(TOOM3_THRESHOLD / math.log2(10))} digits), "
+          f"ntt from {NTT_THRESHOLD} bits (~{int(NTT_THRESHOLD / math.log2(10))} digits)")
+    for slow, fast in (("builtin", "toom3"), ("toom3", "ntt"), ("builtin", "ntt")):
+        if slow in timings and fast in timings:
+            at = crossover(args.digits, timings[slow], timings[fast])
+            print(f"measured: {fast} beats {slow} from " + (f"{at} digits" if at else "none of these sizes"))
@@ -0,0 +1,82 @@
+"""Import time of the backend CLI modules, failing when GUI or plotting modules load at startup.
+
+Each module is imported in a fresh interpreter under `python -X importtime`.
+The best cumulative time over --repeat runs is reported together with the
+heaviest imports, and the exit status is 1 when a module pulls in one of
+its lazy dependencies (tkinter, matplotlib, numpy) or exceeds --budget ms.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --modules backend.closest_pair --repeat 10 --budget 100
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> top-level packages it must not import until they are needed
+LAZY = {
+    "backend.closest_pair": ("tkinter", "matplotlib", "numpy"),
+    "backend.integer_mult": ("tkinter", "matplotlib", "numpy"),
+    "backend.multiply": ("numpy",),
+    "backend.mult_steps": ("numpy",),
+}
+
+
+def import_times(module):
+    """{imported module: (self us, cumulative us)} of one fresh `import module`"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        # import time:       158 |       7593 |   backend.records
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def profile(module, repeat):
+    """(best cumulative ms, times of the fastest run) of importing module"""
+    best = None
+    for _ in range(repeat):
+        times = import_times(module)
+        total = times[module][1] / 1000
+        if best is None or total < best[0]:
+            best = (total, times)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', nargs='+', default=list(LAZY), choices=list(LAZY))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5, help='heaviest imports listed per module')
+    parser.add_argument('--budget', type=float, default=200.0, help='largest acceptable import time in ms')
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    failures = []
+    print(f"{'module':<24} {'import (ms)':>11}  eager lazy deps")
+    for module in args.modules:
+        total, times = profile(module, args.repeat)
+        loaded = sorted({name.split(".")[0] for name in times} & set(LAZY[module]))
+        print(f"{module:<24} {total:>11.1f}  {', '.join(loaded) or '-'}")
+        heaviest = sorted(times.items(), key=lambda item: -item[1][0])[:args.top]
+        for name, (own, _) in heaviest:
+            print(f"{'':<26}{own / 1000:>9.1f}  {name}")
+        if loaded:
+            failures.append(f"{module} imports {', '.join(loaded)} at startup")
+        if total > args.budget:
+            failures.append(f"{module} takes {total:.1f} ms to import (budget {args.budget:.0f} ms)")
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
@@ -0,0 +1,201 @@
+"""Benchmark suite for closest pair and integer multiplication, with JSON results and baseline comparison.
+
+Every case runs on seeded synthetic input (backend/closest_inputfiles.py,
+backend/mult_inputfiles.py) built outside the timed region, with no trace or
+step recording unless the variant is the step engine itself. Each case is run
+--warmup times untimed, then --repeat times; min, median, mean and stdev are
+written to JSON. With --baseline, the chosen statistic is compared per case
+and the exit status is 1 when any case is slower than the baseline by more
+than --threshold.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json --threshold 0.15
+    python benchmarks/bench_suite.py --suite closest --sizes 100 10000 1000000 10000000 --variants numpy-dc
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backend.closest_inputfiles import DISTRIBUTIONS as POINT_DISTRIBUTIONS, generate_points
+from backend.closest_pair import closest_pair
+from backend.mult_batch import multiply_batch
+from backend.mult_inputfiles import DISTRIBUTIONS as NUMBER_DISTRIBUTIONS, generate_numbers
+from backend.mult_steps import multiply_with_steps
+from backend.multiply import multiply
+
+SUITES = ("closest", "mult")
+
+# name -> (closest_pair keyword arguments, runs on Python tuples)
+CLOSEST_VARIANTS = {
+    "python-dc": (dict(engine="python", algorithm="dc"), True),
+    "numpy-dc": (dict(engine="numpy", algorithm="dc"), False),
+    "grid": (dict(algorithm="grid"), True),
+}
+
+MULT_VARIANTS = {
+    "steps": lambda n1, n2: [multiply_with_steps(a, b)[0] for a, b in zip(n1, n2)],
+    "fast": lambda n1, n2: [multiply(a, b) for a, b in zip(n1, n2)],
+    "batch": lambda n1, n2: multiply_batch(n1, n2, workers=1),
+}
+
+STATS = ("min", "median", "mean")
+
+
+def measure(fn, warmup, repeat):
+    """Timing statistics of fn() over `repeat` runs after `warmup` untimed ones"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "times": times,
+    }
+
+
+def closest_cases(args):
+    for dist in args.dist:
+        for n in args.sizes:
+            points = generate_points(n, dist, args.seed, bound=max(1000, 100 * n))
+            tuples = None
+            for name in args.variants:
+                if name not in CLOSEST_VARIANTS:
+                    continue
+                kwargs, wants_tuples = CLOSEST_VARIANTS[name]
+                params = {"dist": dist, "n": n, "variant": name}
+                if wants_tuples and n > args.python_max:
+                    yield params, None
+                    continue
+                if wants_tuples and tuples is None:
+                    tuples = list(map(tuple, points.tolist()))
+                pts = tuples if wants_tuples else points
+                yield params, lambda pts=pts, kwargs=kwargs: closest_pair(pts, **kwargs)
+
+
+def mult_cases(args):
+    for dist in args.mult_dist:
+        for n in args.sizes:
+            for digits in args.digits:
+                nums1 = generate_numbers(n, dist, args.seed, digits=digits)
+                nums2 = generate_numbers(n, dist, args.seed + 1, digits=digits)
+                for name in args.variants:
+                    if name not in MULT_VARIANTS:
+                        continue
+                    params = {"dist": dist, "n": n, "digits": digits, "variant": name}
+                    if name == "steps" and n * digits > args.steps_max:
+                        yield params, None
+                        continue
+                    fn = MULT_VARIANTS[name]
+                    yield params, lambda fn=fn, nums1=nums1, nums2=nums2: fn(nums1, nums2)
+
+
+def case_id(suite, params):
+    return "/".join([suite] + [f"{k}={v}" for k, v in params.items()])
+
+
+def run_suite(args):
+    results = []
+    for suite in args.suite:
+        cases = closest_cases(args) if suite == "closest" else mult_cases(args)
+        for params, fn in cases:
+            cid = case_id(suite, params)
+            if fn is None:
+                print(f"{cid:<58} skipped")
+                continue
+            stats = measure(fn, args.warmup, args.repeat)
+            results.append({"id": cid, "suite": suite, "params": params, **stats})
+            print(f"{cid:<58} {stats['min']:>10.5f} {stats['median']:>10.5f} {stats['stdev']:>9.5f}")
+    return results
+
+
+def compare(results, baseline, stat, threshold):
+    """Print each case against the baseline; returns the ids that regressed"""
+    base = {r["id"]: r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'case':<58} {'baseline':>10} {'now':>10} {'ratio':>7}")
+    for r in results:
+        old = base.get(r["id"])
+        if old is None:
+            print(f"{r['id']:<58} {'new':>10} {r[stat]:>10.5f}")
+            continue
+        ratio = r[stat] / old[stat] if old[stat] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(r["id"])
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{r['id']:<58} {old[stat]:>10.5f} {r[stat]:>10.5f} {ratio:>6.2f}x{flag}")
+    missing = set(base) - {r["id"] for r in results}
+    if missing:
+        print(f"{len(missing)} baseline cases were not run")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suite', choices=SUITES, nargs='+', default=list(SUITES))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000],
+                        help='points (closest) or pairs (mult) per case, up to 10^7')
+    parser.add_argument('--dist', choices=POINT_DISTRIBUTIONS, nargs='+', default=list(POINT_DISTRIBUTIONS))
+    parser.add_argument('--mult-dist', choices=NUMBER_DISTRIBUTIONS, nargs='+', default=["uniform"])
+    parser.add_argument('--digits', type=int, nargs='+', default=[6, 100], help='digits per operand')
+    parser.add_argument('--variants', nargs='+', default=list(CLOSEST_VARIANTS) + list(MULT_VARIANTS),
+                        choices=list(CLOSEST_VARIANTS) + list(MULT_VARIANTS))
+    parser.add_argument('--python-max', type=int, default=100000,
+                        help='largest n given to the pure Python closest pair variants')
+    parser.add_argument('--steps-max', type=int, default=100000,
+                        help='largest pairs x digits given to the step-recording multiplication')
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='write the results here as JSON')
+    parser.add_argument('--baseline', default=None, help='JSON from an earlier --output run to compare against')
+    parser.add_argument('--stat', choices=STATS, default='median', help='statistic compared with the baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='flag cases slower than the baseline by more than this fraction')
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    print(f"{'case':<58} {'min (s)':>10} {'median':>10} {'stdev':>9}")
+    results = run_suite(args)
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.stat, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
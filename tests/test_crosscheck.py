@@ -0,0 +1,187 @@
+"""Cross-checks of the closest pair engines against brute force, and of the step trace against the original rendering.
+
+Run from the repository root:
+    python -m pytest -q
+"""
+import itertools
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.closest_pair import ALGORITHMS, ENGINES, closest_pair
+from backend.metrics import METRICS
+from backend.trace import Trace
+
+
+def brute_force(points, dist):
+    return min(dist(p, q) for p, q in itertools.combinations(points, 2))
+
+
+def make_points(kind, n, seed):
+    rng = random.Random(seed)
+    if kind == "uniform":
+        return [(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(n)]
+    if kind == "dup":
+        # few distinct coordinates: duplicates straddle every split
+        return [(float(rng.randint(0, 4)), float(rng.randint(0, 6))) for _ in range(n)]
+    if kind == "near-dup":
+        # clusters of almost equal points
+        return [(rng.randint(0, 5) + rng.random() * 1e-6, rng.randint(0, 5) + rng.random() * 1e-6)
+                for _ in range(n)]
+    # (lat, lon) degrees, spanning the date line for haversine
+    return [(rng.uniform(-85, 85), rng.uniform(-180, 180)) for _ in range(n)]
+
+
+def supported(engine, algorithm, metric):
+    return metric == "euclidean" or (engine == "python" and algorithm == "dc")
+
+
+@pytest.mark.parametrize("metric", list(METRICS))
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("kind", ["uniform", "dup", "near-dup", "latlon"])
+def test_matches_brute_force(engine, algorithm, metric, kind):
+    if metric == "haversine" and kind != "latlon":
+        pytest.skip("haversine takes (lat, lon) degrees")
+    if not supported(engine, algorithm, metric):
+        with pytest.raises(ValueError):
+            closest_pair(make_points(kind, 10, 0), engine=engine, algorithm=algorithm, metric=metric)
+        return
+    dist = METRICS[metric].dist
+    for seed in range(20):
+        points = make_points(kind, 2 + seed * 7, seed)
+        d, (p, q) = closest_pair(points, engine=engine, algorithm=algorithm, metric=metric)
+        expected = brute_force(points, dist)
+        assert d == pytest.approx(expected, rel=1e-9, abs=1e-12)
+        assert dist(p, q) == pytest.approx(d, rel=1e-9, abs=1e-12)
+        assert p in points and q in points
+
+
+@pytest.mark.parametrize("kind", ["uniform", "dup"])
+def test_workers_and_dimensions(kind):
+    points = make_points(kind, 3000, 1)
+    d, _ = closest_pair(points, workers=2)
+    assert d == pytest.approx(brute_force(points, math.dist))
+
+    rng = random.Random(2)
+    points3 = [(rng.random(), rng.random(), rng.random()) for _ in range(300)]
+    d, (p, q) = closest_pair(points3)
+    assert d == pytest.approx(brute_force(points3, math.dist))
+    assert math.dist(p, q) == pytest.approx(d)
+
+
+def test_numpy_input_matches_list():
+    np = pytest.importorskip("numpy")
+    points = make_points("dup", 200, 3)
+    for engine in ENGINES:
+        assert closest_pair(np.array(points), engine=engine)[0] == closest_pair(points, engine=engine)[0]
+
+
+# The original list-of-strings implementation, as shown step by step by the GUI
+def baseline_brute_force(points, steps):
+    min_d = float('inf')
+    pair = (None, None)
+    n = len(points)
+    steps.append(f"  Brute force on {n} points: {points}")
+    for i in range(n):
+        for j in range(i+1, n):
+            d = math.dist(points[i], points[j])
+            if d < min_d:
+                min_d = d
+                pair = (points[i], points[j])
+                steps.append(f"    New min distance: {min_d:.4f} between {points[i]} and {points[j]}")
+    steps.append(f"  Brute force result: distance = {min_d:.4f}")
+    return min_d, pair
+
+
+def baseline_rec(px, py, depth, steps):
+    indent = "  " * depth
+    n = len(px)
+    steps.append(f"{indent}Level {depth}: Processing {n} points")
+    if n <= 3:
+        steps.append(f"{indent}Base case reached (n <= 3), using brute force")
+        return baseline_brute_force(px, steps)
+
+    mid = n // 2
+    midx = px[mid][0]
+    steps.append(f"{indent}DIVIDE: Splitting at x = {midx:.2f}")
+    steps.append(f"{indent}  Left half: {len(px[:mid])} points")
+    steps.append(f"{indent}  Right half: {len(px[mid:])} points")
+    Qx = px[:mid]
+    Rx = px[mid:]
+    left_set = set(Qx)
+    Qy = [p for p in py if p in left_set]
+    Ry = [p for p in py if p not in left_set]
+
+    steps.append(f"{indent}CONQUER: Recursively solving left half")
+    dl, pair_l = baseline_rec(Qx, Qy, depth + 1, steps)
+    steps.append(f"{indent}CONQUER: Recursively solving right half")
+    dr, pair_r = baseline_rec(Rx, Ry, depth + 1, steps)
+
+    steps.append(f"{indent}COMBINE: Comparing results from left and right")
+    steps.append(f"{indent}  Left min distance: {dl:.4f}")
+    steps.append(f"{indent}  Right min distance: {dr:.4f}")
+    if dl < dr:
+        d, pair = dl, pair_l
+        steps.append(f"{indent}  Taking left result (smaller distance)")
+    else:
+        d, pair = dr, pair_r
+        steps.append(f"{indent}  Taking right result (smaller distance)")
+
+    steps.append(f"{indent}Checking strip around midline x = {midx:.2f} ± {d:.4f}")
+    strip = [p for p in py if abs(p[0] - midx) < d]
+    steps.append(f"{indent}  Strip contains {len(strip)} points")
+    strip_improved = False
+    for i in range(len(strip)):
+        j = i + 1
+        while j < len(strip) and (strip[j][1] - strip[i][1]) < d:
+            curd = math.dist(strip[i], strip[j])
+            if curd < d:
+                d = curd
+                pair = (strip[i], strip[j])
+                strip_improved = True
+                steps.append(f"{indent}  🎯 New closest pair in strip: {strip[i]} and {strip[j]}")
+                steps.append(f"{indent}  New min distance: {d:.4f}")
+            j += 1
+    if strip_improved:
+        steps.append(f"{indent}✓ Strip check improved the result")
+    else:
+        steps.append(f"{indent}  Strip check didn't improve result")
+    steps.append(f"{indent}Final result at level {depth}: distance = {d:.4f}")
+    return d, pair
+
+
+def baseline_steps(points):
+    steps = ["Initial setup:", f"  Total points: {len(points)}", "  Sorting points by x-coordinate..."]
+    px = sorted(points, key=lambda p: (p[0], p[1]))
+    steps.append("  Sorting points by y-coordinate...")
+    py = sorted(points, key=lambda p: (p[1], p[0]))
+    steps += ["Starting divide-and-conquer algorithm...", "=" * 50]
+    min_dist, pair = baseline_rec(px, py, 0, steps)
+    steps += ["=" * 50, "FINAL RESULT:", f"  Closest pair: {pair[0]} and {pair[1]}",
+              f"  Minimum distance: {min_dist:.6f}"]
+    return steps
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 7, 16, 33, 100, 257])
+def test_trace_matches_baseline(n):
+    # distinct x values and no duplicates, where the set-based and rank-based splits agree
+    rng = random.Random(n)
+    xs = rng.sample(range(10 * n), n)
+    points = [(float(x), float(rng.randint(0, 10 * n))) for x in xs]
+    expected = "\n".join(baseline_steps(points))
+
+    # a step may span several of the original lines (the setup block is one step)
+    steps = []
+    closest_pair(points, steps)
+    assert "\n".join(steps) == expected
+
+    # the GUI keeps a capped Trace and renders one event at a time
+    trace = Trace.capped(points)
+    closest_pair(points, trace)
+    assert "\n".join(trace.render(k) for k in range(len(trace))) == expected